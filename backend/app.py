@@ -22,8 +22,8 @@ app.config['UPLOAD_EXTENSIONS'] = config.UPLOAD_EXTENSIONS
 CORS(app, 
      resources={r"/*": {
          "origins": config.ALLOWED_ORIGINS,
-         "methods": ["GET", "POST", "OPTIONS"],
-         "allow_headers": ["Content-Type"],
+         "methods": ["GET", "POST", "DELETE", "OPTIONS"],
+         "allow_headers": ["Content-Type", "Content-Encoding", "Authorization"],
          "expose_headers": ["Content-Type"],
          "supports_credentials": False,
          "max_age": config.CORS_MAX_AGE
@@ -32,6 +32,10 @@ CORS(app,
 # Register blueprints
 app.register_blueprint(api)
 
+# Load the model at worker startup when configured (cheap with a bundled model)
+if config.PRELOAD_MODEL:
+    preload_model()
+
 
 # Error handlers
 @app.errorhandler(413)
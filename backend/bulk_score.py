@@ -0,0 +1,329 @@
+"""
+Offline bulk scoring of resume PDFs against a set of job descriptions
+
+Usage:
+    python bulk_score.py --resumes ./resumes --jobs ./jobs --output scores.jsonl
+
+PDFs are parsed (and their keywords extracted) in a process pool while this
+process owns the model and encodes resumes in batches. Each batch is scored
+against all jobs at once: one similarity matrix for the embeddings and one
+sparse keyword product (see services.keyword_engine). Results are appended to
+the output file as they are produced, so re-running the same command resumes
+an interrupted run.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from sklearn.metrics.pairwise import cosine_similarity
+from config import get_config
+from utils import extract_text_from_pdf, detect_experience_level, extract_keywords
+from services import KeywordMatchEngine, combine_match_scores
+from models import get_bert_embeddings_batch
+
+config = get_config()
+
+CSV_FIELDS = [
+    'resume', 'job', 'experience_level', 'match_score', 'skills_match',
+    'experience_match', 'keyword_match', 'common_keywords', 'error'
+]
+
+
+def parse_resume(path):
+    """
+    Extract text, experience level and keywords from a resume PDF (runs in a worker process)
+
+    Args:
+        path: Path to the resume PDF
+
+    Returns:
+        tuple: (path, resume_text or None, experience_level or None, keywords or None)
+    """
+    try:
+        with open(path, 'rb') as f:
+            resume_text = extract_text_from_pdf(f)
+        if not resume_text:
+            return path, None, None, None
+        return path, resume_text, detect_experience_level(resume_text), extract_keywords(resume_text)
+    except Exception as e:
+        # One unreadable file must not abort the whole run; it gets an error row instead
+        print(f"Error parsing {path}: {str(e)}")
+        return path, None, None, None
+
+
+def list_files(path, extensions):
+    """
+    List files under a directory (or a single file) matching the given extensions
+
+    Args:
+        path: Directory or file path
+        extensions: Tuple of lowercase extensions, e.g. ('.pdf',)
+
+    Returns:
+        list: Sorted file paths
+    """
+    if os.path.isfile(path):
+        return [path]
+
+    files = []
+    for root, _, names in os.walk(path):
+        for name in names:
+            if name.lower().endswith(extensions):
+                files.append(os.path.join(root, name))
+    return sorted(files)
+
+
+def load_jobs(path):
+    """
+    Load job descriptions from .txt files, keyed by file name without extension
+
+    Args:
+        path: Directory of .txt files or a single .txt file
+
+    Returns:
+        dict: job_id -> job description text
+    """
+    jobs = {}
+    for job_path in list_files(path, ('.txt',)):
+        with open(job_path, encoding='utf-8') as f:
+            text = f.read().strip()
+        if len(text) < config.MIN_JOB_DESCRIPTION_LENGTH:
+            print(f"Skipping job {job_path}: shorter than {config.MIN_JOB_DESCRIPTION_LENGTH} characters")
+            continue
+        jobs[os.path.splitext(os.path.basename(job_path))[0]] = text[:config.MAX_JOB_DESCRIPTION_LENGTH]
+    return jobs
+
+
+def load_checkpoint(output_path, output_format):
+    """
+    Read already-written results so an interrupted run can resume
+
+    Args:
+        output_path: Output file path
+        output_format: 'jsonl' or 'csv'
+
+    Returns:
+        set: (resume, job) pairs already scored
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    _truncate_partial_record(output_path)
+    with open(output_path, encoding='utf-8', newline='') as f:
+        if output_format == 'csv':
+            # Only rows with every column count as done
+            rows = (row for row in csv.DictReader(f) if all(row.get(field) is not None for field in CSV_FIELDS))
+        else:
+            rows = []
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue
+        for row in rows:
+            done.add((row['resume'], row['job']))
+    return done
+
+
+def _truncate_partial_record(path, chunk_size=65536):
+    """Cut a file back to its last newline, dropping a record left half-written by an interrupted run"""
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - chunk_size)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b'\n')
+            if newline >= 0:
+                keep = start + newline + 1
+                break
+            position = start
+        else:
+            keep = 0
+        if keep < end:
+            print(f"Dropping {end - keep} bytes of a partial record from {path}")
+            f.truncate(keep)
+
+
+class ResultWriter:
+    """Append-only JSONL/CSV writer that flushes every batch"""
+
+    def __init__(self, output_path, output_format):
+        self.output_format = output_format
+        write_header = output_format == 'csv' and (
+            not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        )
+        # load_checkpoint has already cut off any partial last record
+        self._file = open(output_path, 'a', encoding='utf-8', newline='')
+        if output_format == 'csv':
+            self._csv = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+            if write_header:
+                self._csv.writeheader()
+
+    def write(self, row):
+        if self.output_format == 'csv':
+            row = dict(row, common_keywords=';'.join(row.get('common_keywords') or []))
+            self._csv.writerow({field: row.get(field) for field in CSV_FIELDS})
+        else:
+            self._file.write(json.dumps(row) + '\n')
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def score_batch(batch, job_ids, job_embeddings, keyword_engine, done, writer, experience_level):
+    """
+    Encode a batch of parsed resumes and score each against every pending job
+
+    Args:
+        batch: List of parse_resume results
+        job_ids: Job ids, in job_embeddings / keyword_engine order
+        job_embeddings: Job description embeddings (one row per job)
+        keyword_engine: KeywordMatchEngine built from the job keyword sets
+        done: Set of (resume, job) pairs already written
+        writer: ResultWriter
+        experience_level: Fixed level or 'auto' to use the detected one
+
+    Returns:
+        int: Number of rows written
+    """
+    written = 0
+    parsed = [item for item in batch if item[1]]
+    if parsed:
+        resume_embeddings = get_bert_embeddings_batch([text for _, text, _, _ in parsed])
+        similarities = cosine_similarity(resume_embeddings, job_embeddings)
+        keyword_result = keyword_engine.score([keywords for _, _, _, keywords in parsed])
+
+    for path, resume_text, _, _ in batch:
+        if resume_text:
+            continue
+        for job_id in job_ids:
+            if (path, job_id) not in done:
+                writer.write({'resume': path, 'job': job_id, 'error': 'Could not extract text from PDF'})
+                written += 1
+
+    for i, (path, _, detected_level, _) in enumerate(parsed):
+        level = detected_level if experience_level == 'auto' else experience_level
+        for j, job_id in enumerate(job_ids):
+            if (path, job_id) in done:
+                continue
+            match_score, skills_match, experience_match, keyword_match = combine_match_scores(
+                similarities[i, j], keyword_result.keyword_match[i, j], level
+            )
+            common_keywords = keyword_result.common_keywords(i, j)
+            writer.write({
+                'resume': path,
+                'job': job_id,
+                'experience_level': level,
+                'match_score': match_score,
+                'skills_match': skills_match,
+                'experience_match': experience_match,
+                'keyword_match': keyword_match,
+                'common_keywords': sorted(common_keywords)
+            })
+            written += 1
+
+    writer.flush()
+    return written
+
+
+def print_progress(resumes_done, resumes_total, rows_written, start_time):
+    """Print a single-line progress and throughput report"""
+    elapsed = max(time.time() - start_time, 1e-6)
+    rate = resumes_done / elapsed
+    eta = (resumes_total - resumes_done) / rate if rate > 0 else 0
+    print(
+        f"\r{resumes_done}/{resumes_total} resumes | {rows_written} scores | "
+        f"{rate:.1f} resumes/s | {rows_written / elapsed:.1f} scores/s | ETA {eta:.0f}s",
+        end='', file=sys.stderr, flush=True
+    )
+
+
+def run(args):
+    """
+    Run the bulk scoring job
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    output_format = args.format or ('csv' if args.output.lower().endswith('.csv') else 'jsonl')
+
+    jobs = load_jobs(args.jobs)
+    if not jobs:
+        print("No job descriptions found")
+        return 1
+
+    resumes = list_files(args.resumes, tuple(config.UPLOAD_EXTENSIONS))
+    done = load_checkpoint(args.output, output_format)
+    pending = [path for path in resumes if any((path, job_id) not in done for job_id in jobs)]
+    print(f"{len(resumes)} resumes x {len(jobs)} jobs, {len(resumes) - len(pending)} resumes already scored")
+    if not pending:
+        return 0
+
+    writer = ResultWriter(args.output, output_format)
+    start_time = time.time()
+    resumes_done = 0
+    rows_written = 0
+    batch = []
+    try:
+        # Workers are forked before the model is loaded so they stay small
+        with Pool(processes=args.workers) as pool:
+            parsed = pool.imap_unordered(parse_resume, pending, chunksize=4)
+
+            # Job embeddings and keyword vocabulary are built once and reused for every resume
+            job_ids = list(jobs)
+            job_embeddings = get_bert_embeddings_batch([jobs[job_id] for job_id in job_ids])
+            keyword_engine = KeywordMatchEngine([extract_keywords(jobs[job_id]) for job_id in job_ids])
+
+            for item in parsed:
+                batch.append(item)
+                if len(batch) >= args.batch_size:
+                    rows_written += score_batch(
+                        batch, job_ids, job_embeddings, keyword_engine, done, writer, args.experience_level
+                    )
+                    resumes_done += len(batch)
+                    batch = []
+                    print_progress(resumes_done, len(pending), rows_written, start_time)
+            if batch:
+                rows_written += score_batch(
+                    batch, job_ids, job_embeddings, keyword_engine, done, writer, args.experience_level
+                )
+                resumes_done += len(batch)
+                print_progress(resumes_done, len(pending), rows_written, start_time)
+    finally:
+        writer.close()
+        print(file=sys.stderr)
+
+    elapsed = time.time() - start_time
+    print(f"Scored {resumes_done} resumes ({rows_written} rows) in {elapsed:.1f} seconds")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Score resume PDFs against job descriptions offline')
+    parser.add_argument('--resumes', required=True, help='Directory of resume PDFs (or a single PDF)')
+    parser.add_argument('--jobs', required=True, help='Directory of job description .txt files (or a single file)')
+    parser.add_argument('--output', required=True, help='Output file (.jsonl or .csv); existing results are skipped')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help='Output format (default: from file extension)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='PDF parsing processes')
+    parser.add_argument('--batch-size', type=int, default=config.EMBEDDINGS_BATCH_SIZE,
+                        help='Resumes encoded per batch')
+    parser.add_argument('--experience-level', default='auto', choices=config.VALID_EXPERIENCE_LEVELS,
+                        help='Experience level to score with (default: auto-detect per resume)')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    sys.exit(run(parse_args()))
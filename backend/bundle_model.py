@@ -0,0 +1,64 @@
+"""
+Bundle the sentence transformer model into a local directory (build-time step)
+
+Usage:
+    python bundle_model.py [--output ./model_bundle]
+
+Writes the model as safetensors weights plus its tokenizer and configs, so the
+server can load it from disk with no network access.
+"""
+import argparse
+import json
+import os
+import time
+from sentence_transformers import SentenceTransformer
+from config import get_config
+from models import BUNDLE_INFO_FILE, BUNDLE_WEIGHTS_FILE
+
+config = get_config()
+
+
+def bundle_model(model_name, output_dir):
+    """
+    Download a model and save it as a local bundle
+
+    Args:
+        model_name: Hugging Face model name
+        output_dir: Bundle directory
+
+    Returns:
+        str: Path of the bundled weights file
+    """
+    start_time = time.perf_counter()
+    info_path = os.path.join(output_dir, BUNDLE_INFO_FILE)
+    if os.path.exists(info_path):
+        os.remove(info_path)
+
+    model = SentenceTransformer(model_name, device='cpu')
+    model.save(output_dir, create_model_card=False, safe_serialization=True)
+
+    weights_path = os.path.join(output_dir, BUNDLE_WEIGHTS_FILE)
+    if not os.path.isfile(weights_path):
+        raise RuntimeError(f"Model save did not produce {weights_path}")
+
+    # Written last: the loader only trusts bundles that finished writing
+    with open(info_path, 'w') as f:
+        json.dump({'model_name': model_name}, f)
+
+    size_mb = os.path.getsize(weights_path) / (1024 * 1024)
+    print(f"Bundled {model_name} into {output_dir} ({size_mb:.0f}MB weights) "
+          f"in {time.perf_counter() - start_time:.1f} seconds")
+    return weights_path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Bundle the sentence transformer model for offline loading')
+    parser.add_argument('--model', default=config.MODEL_NAME, help='Model name (default: config.MODEL_NAME)')
+    parser.add_argument('--output', default=config.MODEL_BUNDLE_DIR,
+                        help='Bundle directory (default: config.MODEL_BUNDLE_DIR)')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    bundle_model(args.model, args.output)
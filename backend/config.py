@@ -25,14 +25,41 @@ class Config:
     
     # Model settings - production-grade model for Hugging Face Spaces (16GB RAM)
     MODEL_NAME = os.getenv('MODEL_NAME', 'sentence-transformers/all-mpnet-base-v2')  # 420MB production model
+    MODEL_BUNDLE_DIR = os.getenv('MODEL_BUNDLE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model_bundle'))
+    PRELOAD_MODEL = os.getenv('PRELOAD_MODEL', 'false').lower() == 'true'  # Load at worker startup
     MAX_TEXT_LENGTH = 5000  # 5000 characters
     MAX_SEQUENCE_LENGTH = 512  # 512 tokens
     EMBEDDINGS_CACHE_SIZE = 32  # LRU cache for embeddings
+    EMBEDDINGS_BATCH_SIZE = int(os.getenv('EMBEDDINGS_BATCH_SIZE', 32))  # Batched encodes (bulk scoring)
+    
+    # Inference threading - one shared model, N concurrent encodes
+    INFERENCE_THREADS = int(os.getenv('INFERENCE_THREADS', 1))  # Match gunicorn --threads to encode in parallel
+    TORCH_INTRA_OP_THREADS = int(os.getenv('TORCH_INTRA_OP_THREADS', 0))  # 0 = available cores // INFERENCE_THREADS
+    TORCH_INTER_OP_THREADS = int(os.getenv('TORCH_INTER_OP_THREADS', 1))
+    PIPELINE_THREADS = int(os.getenv('PIPELINE_THREADS', 4))  # Shared pool for per-request /analyze stages
+    
+    # Job index settings (reverse matching: resume -> top-k jobs)
+    JOB_INDEX_DIR = os.getenv('JOB_INDEX_DIR', '/tmp/job_index')
+    JOB_INDEX_DTYPE = os.getenv('JOB_INDEX_DTYPE', 'float16')  # 'float16' or 'int8'
+    JOB_INDEX_BLOCK_SIZE = 4096  # Rows scored per matrix product
+    JOB_INDEX_INITIAL_CAPACITY = 1024  # Rows allocated up front, doubled on growth
+    JOB_MATCH_DEFAULT_TOP_K = 10
+    JOB_MATCH_MAX_TOP_K = 50
+    JOB_MATCH_RERANK_FACTOR = 3  # Candidates re-ranked per requested result
+    JOB_ADMIN_TOKEN = os.getenv('JOB_ADMIN_TOKEN', '')  # Required to add/remove jobs; unset disables both
+
+    # Analysis session settings (incremental re-scoring of resume edits)
+    SESSION_DIR = os.getenv('SESSION_DIR', '/tmp/sessions')  # Shared by workers, survives worker restarts
+    SESSION_CACHE_SIZE = 64  # Sessions kept in memory per worker
+    SESSION_TTL_SECONDS = 1800  # Idle sessions expire after 30 minutes
+    SESSION_CHUNK_LINES = 8  # Average resume lines per re-encodable chunk
     
     # Validation settings
     MIN_JOB_DESCRIPTION_LENGTH = 50
     MAX_JOB_DESCRIPTION_LENGTH = 10000
     MIN_RESUME_TEXT_LENGTH = 100
+    MAX_RESUME_TEXT_LENGTH = 100000  # Pre-extracted resume text (JSON payloads)
+    MAX_TEXT_PAYLOAD_SIZE = 1024 * 1024  # 1MB decompressed JSON payload
     MAX_PDF_PAGES = 20
     
     # Experience levels
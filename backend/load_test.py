@@ -0,0 +1,449 @@
+"""
+Load and soak test harness for the gunicorn-served app
+
+Usage:
+    python load_test.py --stub --rates 0.5,2 --duration 120 \\
+        --server "workers=1,threads=1,max-requests=10,timeout=180" \\
+        --server "workers=1,threads=4,timeout=180,INFERENCE_THREADS=4"
+
+Each --server spec starts `gunicorn app:app` (or the stub-model app with
+--stub) with the given lowercase gunicorn flags and UPPERCASE environment
+variables, then replays a mix of synthetic /analyze requests at each target
+rate. Latency percentiles, error/timeout rates, RSS over time and model load
+counts are collected for every run and printed as a comparison report.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+REQUEST_KINDS = ['pdf', 'json', 'gzip', 'invalid']
+
+_SKILLS = [
+    'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'node', 'docker', 'kubernetes',
+    'aws', 'azure', 'gcp', 'sql', 'postgresql', 'mongodb', 'machine learning', 'data science',
+    'deep learning', 'web development', 'rest api', 'graphql', 'ci/cd', 'linux', 'spark', 'kafka'
+]
+_VERBS = ['Developed', 'Implemented', 'Led', 'Designed', 'Built', 'Managed', 'Optimized', 'Maintained']
+_NOUNS = ['services', 'pipelines', 'dashboards', 'platforms', 'APIs', 'frontends', 'data models', 'deployments']
+
+
+class StubSentenceTransformer:
+    """
+    Stand-in for SentenceTransformer with configurable load time, memory and encode cost
+
+    Environment:
+        STUB_LOAD_SECONDS: Time to "load" the model (default 2)
+        STUB_MODEL_MB: Memory held by the model (default 420)
+        STUB_ENCODE_SECONDS: Time per encoded text (default 0.15)
+    """
+
+    def __init__(self, model_name, device='cpu'):
+        import numpy as np
+        time.sleep(float(os.getenv('STUB_LOAD_SECONDS', 2)))
+        self._weights = np.ones(int(os.getenv('STUB_MODEL_MB', 420)) * 1024 * 1024 // 8)
+        self._encode_seconds = float(os.getenv('STUB_ENCODE_SECONDS', 0.15))
+        self._dim = 768
+
+    def tokenize(self, texts):
+        return texts
+
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False, batch_size=32):
+        import numpy as np
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        time.sleep(self._encode_seconds * len(texts))
+        embeddings = np.vstack([
+            np.random.default_rng(int(hashlib.md5(text.encode('utf-8')).hexdigest()[:8], 16))
+            .standard_normal(self._dim).astype(np.float32)
+            for text in texts
+        ])
+        return embeddings[0] if single else embeddings
+
+
+def stub_app():
+    """
+    gunicorn app factory (`load_test:stub_app()`) serving app:app with the stub model
+
+    Returns:
+        Flask: The application
+    """
+    import models
+    models.SentenceTransformer = StubSentenceTransformer
+    models._has_model_bundle = lambda bundle_dir: False
+    from app import app
+    return app
+
+
+def make_resume_text(rng):
+    """Random resume-like text"""
+    years = rng.randint(0, 12)
+    lines = [
+        f"Software Engineer with {years} years of experience",
+        "Skills: " + ', '.join(rng.sample(_SKILLS, 8)),
+    ]
+    for _ in range(rng.randint(10, 40)):
+        lines.append(f"{rng.choice(_VERBS)} {rng.choice(_NOUNS)} using {rng.choice(_SKILLS)} and {rng.choice(_SKILLS)}")
+    return '\n'.join(lines)
+
+
+def make_job_description(rng):
+    """Random job-description-like text"""
+    skills = rng.sample(_SKILLS, 6)
+    return (
+        f"We are hiring an engineer experienced in {', '.join(skills[:3])}. "
+        f"You will build {rng.choice(_NOUNS)} and work with {', '.join(skills[3:])}. "
+        f"{rng.randint(1, 8)}+ years of experience preferred."
+    )
+
+
+def make_pdf(text):
+    """Minimal single-page PDF with the text as extractable lines"""
+    def escape(line):
+        return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    stream = 'BT /F1 10 Tf 12 TL 40 800 Td\n'
+    stream += ''.join(f"({escape(line)}) '\n" for line in text.splitlines()[:60])
+    stream += 'ET'
+    objects = [
+        '<< /Type /Catalog /Pages 2 0 R >>',
+        '<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] '
+        '/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>',
+        '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+        f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream',
+    ]
+    pdf = '%PDF-1.4\n'
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f'{i} 0 obj\n{obj}\nendobj\n'
+    xref_offset = len(pdf)
+    pdf += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'
+    pdf += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets)
+    pdf += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n'
+    return pdf.encode('latin-1')
+
+
+def build_request(kind, rng, base_url):
+    """
+    Build a synthetic /analyze request
+
+    Args:
+        kind: 'pdf', 'json', 'gzip' or 'invalid'
+        rng: random.Random
+        base_url: Server base URL
+
+    Returns:
+        urllib.request.Request: The request
+    """
+    resume_text = make_resume_text(rng)
+    job_description = make_job_description(rng)
+    if kind == 'invalid':
+        job_description = 'too short'
+
+    if kind in ('pdf', 'invalid'):
+        boundary = uuid.uuid4().hex
+        body = b''
+        for name, value in [('jobDescription', job_description), ('experienceLevel', 'auto')]:
+            body += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n').encode()
+        body += (f'--{boundary}\r\nContent-Disposition: form-data; name="resume"; filename="resume.pdf"\r\n'
+                 'Content-Type: application/pdf\r\n\r\n').encode()
+        body += make_pdf(resume_text) + f'\r\n--{boundary}--\r\n'.encode()
+        headers = {'Content-Type': f'multipart/form-data; boundary={boundary}'}
+    else:
+        body = json.dumps({
+            'resumeText': resume_text,
+            'resumeTextHash': hashlib.sha256(resume_text.encode('utf-8')).hexdigest(),
+            'jobDescription': job_description,
+        }).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        if kind == 'gzip':
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+
+    return urllib.request.Request(f'{base_url}/analyze', data=body, headers=headers, method='POST')
+
+
+def parse_server_spec(spec):
+    """
+    Split a server spec into gunicorn arguments and environment variables
+
+    Args:
+        spec: e.g. "workers=1,threads=4,timeout=180,INFERENCE_THREADS=4"
+
+    Returns:
+        tuple: (list of gunicorn args, dict of env vars)
+    """
+    args, env = [], {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        key, _, value = item.partition('=')
+        if key.isupper():
+            env[key] = value
+        else:
+            args += [f'--{key}', value]
+    return args, env
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _process_tree_rss(pid):
+    """Total RSS in MB of a process and its descendants (Linux /proc)"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f'/proc/{current}/status') as f:
+                match = re.search(r'VmRSS:\s+(\d+)', f.read())
+            total_kb += int(match.group(1)) if match else 0
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+class Server:
+    """A gunicorn server process with its output captured to a log file"""
+
+    def __init__(self, spec, stub, log_path):
+        self.spec = spec
+        self.port = _free_port()
+        self.base_url = f'http://127.0.0.1:{self.port}'
+        self.log_path = log_path
+        gunicorn_args, env_overrides = parse_server_spec(spec)
+        env = dict(os.environ, PYTHONUNBUFFERED='1', **env_overrides)
+        target = 'load_test:stub_app()' if stub else 'app:app'
+        self._log = open(log_path, 'w')
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{self.port}', *gunicorn_args, target],
+            cwd=BACKEND_DIR, env=env, stdout=self._log, stderr=subprocess.STDOUT
+        )
+
+    def wait_ready(self, timeout):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited during startup; see {self.log_path}")
+            try:
+                with urllib.request.urlopen(f'{self.base_url}/', timeout=2):
+                    return
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.5)
+        raise RuntimeError(f"Server not ready after {timeout} seconds; see {self.log_path}")
+
+    def log_counts(self):
+        """Model loads and worker boots seen in the server output"""
+        with open(self.log_path, errors='replace') as f:
+            log = f.read()
+        return {
+            'modelLoads': log.count('Model loaded successfully'),
+            'workerBoots': log.count('Booting worker'),
+            'workerTimeouts': log.count('WORKER TIMEOUT'),
+        }
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self._log.close()
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of a sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_load(server, rate, duration, mix, request_timeout, max_in_flight, seed):
+    """
+    Replay synthetic requests at a target rate (open loop, Poisson arrivals)
+
+    Returns:
+        dict: Latency, error and RSS measurements
+    """
+    rng = random.Random(seed)
+    kinds, weights = zip(*mix.items())
+    results = []
+    results_lock = threading.Lock()
+    rss_samples = []
+    stop_sampling = threading.Event()
+
+    def sample_rss():
+        start = time.time()
+        while not stop_sampling.is_set():
+            rss_samples.append((round(time.time() - start, 1), round(_process_tree_rss(server.process.pid), 1)))
+            stop_sampling.wait(1.0)
+
+    def send(request, kind, scheduled):
+        # Latency counts from the scheduled send time, so client-side queueing is not hidden
+        start = scheduled
+        outcome = 'ok'
+        status = None
+        try:
+            with urllib.request.urlopen(request, timeout=request_timeout) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except (socket.timeout, TimeoutError):
+            outcome = 'timeout'
+        except urllib.error.URLError as e:
+            # Connect timeouts arrive wrapped in URLError
+            outcome = 'timeout' if isinstance(e.reason, (socket.timeout, TimeoutError)) else 'error'
+        except OSError:
+            outcome = 'error'
+        if outcome == 'ok' and status is not None and status >= 500:
+            outcome = 'error'
+        elif outcome == 'ok' and kind != 'invalid' and status != 200:
+            outcome = 'error'
+        with results_lock:
+            results.append((kind, outcome, status, time.perf_counter() - start, time.time()))
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    sent = 0
+    start = time.time()
+    next_send = start
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        while time.time() - start < duration:
+            next_send += rng.expovariate(rate)
+            time.sleep(max(0.0, next_send - time.time()))
+            kind = rng.choices(kinds, weights)[0]
+            executor.submit(send, build_request(kind, rng, server.base_url), kind, time.perf_counter())
+            sent += 1
+        # Throughput covers the send window only, not the wait for stragglers
+        send_end = time.time()
+    drain_seconds = time.time() - send_end
+    stop_sampling.set()
+    sampler.join()
+
+    latencies = sorted(latency for kind, outcome, _, latency, _ in results if outcome == 'ok' and kind != 'invalid')
+    outcomes = [outcome for _, outcome, _, _, _ in results]
+    ok_in_window = sum(1 for _, outcome, _, _, finished in results if outcome == 'ok' and finished <= send_end)
+    rss_values = [rss for _, rss in rss_samples]
+    return {
+        'sent': sent,
+        'completed': len(results),
+        'throughput': round(ok_in_window / (send_end - start), 2),
+        'drainSeconds': round(drain_seconds, 1),
+        'p50': percentile(latencies, 50),
+        'p90': percentile(latencies, 90),
+        'p99': percentile(latencies, 99),
+        'errorRate': round(outcomes.count('error') / len(results), 4) if results else None,
+        'timeoutRate': round(outcomes.count('timeout') / len(results), 4) if results else None,
+        'rssPeakMB': max(rss_values) if rss_values else None,
+        'rssMeanMB': round(sum(rss_values) / len(rss_values), 1) if rss_values else None,
+        'rssTimeline': rss_samples,
+    }
+
+
+def print_report(runs):
+    """Print a comparison table of all runs"""
+    def fmt(value, scale=1.0, digits=2):
+        return '-' if value is None else f'{value * scale:.{digits}f}'
+
+    header = (f"{'server':<48} {'rate':>5} {'sent':>5} {'ok/s':>6} {'p50 s':>7} {'p90 s':>7} {'p99 s':>7} "
+              f"{'err%':>6} {'tmo%':>6} {'rss pk':>7} {'loads':>5} {'boots':>5}")
+    print(header)
+    print('-' * len(header))
+    for run in runs:
+        print(
+            f"{run['server'][:48]:<48} {run['rate']:>5g} {run['sent']:>5} {fmt(run['throughput']):>6} "
+            f"{fmt(run['p50']):>7} {fmt(run['p90']):>7} {fmt(run['p99']):>7} "
+            f"{fmt(run['errorRate'], 100, 1):>6} {fmt(run['timeoutRate'], 100, 1):>6} "
+            f"{fmt(run['rssPeakMB'], digits=0):>7} {run['modelLoads']:>5} {run['workerBoots']:>5}"
+        )
+
+
+def parse_mix(mix):
+    """Parse "pdf=0.5,json=0.3,gzip=0.2" into request kind weights"""
+    weights = {}
+    for item in mix.split(','):
+        kind, _, weight = item.partition('=')
+        if kind not in REQUEST_KINDS:
+            raise argparse.ArgumentTypeError(f"Unknown request kind: {kind}")
+        weights[kind] = float(weight)
+    return weights
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Load/soak test the app under different gunicorn settings')
+    parser.add_argument('--server', action='append',
+                        help='Server spec: comma-separated gunicorn flags (lowercase) and env vars (UPPERCASE)')
+    parser.add_argument('--stub', action='store_true', help='Serve with a stub model instead of the real one')
+    parser.add_argument('--rates', default='1', help='Comma-separated target request rates (requests/second)')
+    parser.add_argument('--duration', type=float, default=60, help='Seconds per run (use long runs to soak)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('pdf=0.5,json=0.3,gzip=0.15,invalid=0.05'),
+                        help='Request mix weights (pdf, json, gzip, invalid)')
+    parser.add_argument('--request-timeout', type=float, default=200, help='Client timeout per request')
+    parser.add_argument('--max-in-flight', type=int, default=64, help='Maximum concurrent client requests')
+    parser.add_argument('--startup-timeout', type=float, default=600, help='Seconds to wait for the server')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for request generation')
+    parser.add_argument('--output', default='load_test_report.json', help='JSON report path')
+    parser.add_argument('--log-dir', default='load_test_logs', help='Directory for server logs')
+    return parser.parse_args(argv)
+
+
+def main(args):
+    servers = args.server or ['workers=1,threads=1,timeout=180,worker-class=sync,max-requests=10,max-requests-jitter=5']
+    rates = [float(rate) for rate in args.rates.split(',')]
+    os.makedirs(args.log_dir, exist_ok=True)
+
+    runs = []
+    for server_index, spec in enumerate(servers):
+        for rate in rates:
+            log_path = os.path.join(args.log_dir, f'server{server_index}_rate{rate:g}.log')
+            print(f"Running {spec} at {rate:g} req/s for {args.duration:g}s (log: {log_path})")
+            server = Server(spec, args.stub, log_path)
+            try:
+                server.wait_ready(args.startup_timeout)
+                result = run_load(server, rate, args.duration, args.mix,
+                                  args.request_timeout, args.max_in_flight, args.seed)
+            finally:
+                server.stop()
+            runs.append(dict(result, server=spec, rate=rate, **server.log_counts()))
+
+    print()
+    print_report(runs)
+    with open(args.output, 'w') as f:
+        json.dump({'stub': args.stub, 'duration': args.duration, 'mix': args.mix, 'runs': runs}, f, indent=2)
+    print(f"\nFull report (including RSS timelines) written to {args.output}")
+
+
+if __name__ == '__main__':
+    main(parse_args())
@@ -3,7 +3,12 @@ Sentence transformer model management and embeddings generation
 """
 import os
 import gc
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+import torch
 from sentence_transformers import SentenceTransformer
 from config import get_config
 
@@ -14,30 +19,167 @@ os.environ.setdefault('HF_HOME', '/tmp/huggingface')
 
 # Global variable for model caching
 _model = None
+_model_load_seconds = None
+_model_lock = threading.Lock()
+
+# Inference threads sharing the model (created with the model)
+_inference_executor = None
+
+# Files written by bundle_model.py
+BUNDLE_INFO_FILE = 'bundle.json'
+BUNDLE_WEIGHTS_FILE = 'model.safetensors'
 
 
 def get_model():
     """
     Get sentence transformer model with aggressive memory optimization
     
+    Uses the bundled local model when one matching config.MODEL_NAME exists
+    in config.MODEL_BUNDLE_DIR, otherwise downloads from the Hugging Face hub.
+    
     Returns:
         SentenceTransformer: Loaded model
     """
-    global _model
-    if _model is None:
+    global _model, _model_load_seconds
+    if _model is not None:
+        return _model
+
+    # Single-flight: concurrent first requests wait for one load
+    with _model_lock:
+        if _model is not None:
+            return _model
+
         print(f"Loading sentence transformer model: {config.MODEL_NAME}...")
+        _configure_torch_threads()
         # Force garbage collection before loading
         gc.collect()
-        _model = SentenceTransformer(
-            config.MODEL_NAME,
-            device='cpu'  # Force CPU to reduce memory
-        )
+        start_time = time.perf_counter()
+        if _has_model_bundle(config.MODEL_BUNDLE_DIR):
+            model = _load_bundled_model(config.MODEL_BUNDLE_DIR)
+            source = f"bundle {config.MODEL_BUNDLE_DIR}"
+        else:
+            model = SentenceTransformer(
+                config.MODEL_NAME,
+                device='cpu'  # Force CPU to reduce memory
+            )
+            source = "hub"
+        model.tokenize = _serialized(model.tokenize)
+        _model_load_seconds = time.perf_counter() - start_time
         # Aggressive memory cleanup after loading
         gc.collect()
-        print("Model loaded successfully")
+        print(f"Model loaded successfully from {source} in {_model_load_seconds:.2f} seconds")
+        _model = model
     return _model
 
 
+def get_thread_settings():
+    """
+    Partition the available cores between inference threads
+    
+    Returns:
+        tuple: (inference_threads, intra_op_threads, inter_op_threads)
+    """
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS
+        cores = os.cpu_count() or 1
+
+    inference_threads = max(1, config.INFERENCE_THREADS)
+    intra_op_threads = config.TORCH_INTRA_OP_THREADS or max(1, cores // inference_threads)
+    inter_op_threads = max(1, config.TORCH_INTER_OP_THREADS)
+    return inference_threads, intra_op_threads, inter_op_threads
+
+
+def _configure_torch_threads():
+    """Apply torch thread settings and start the inference threads"""
+    global _inference_executor
+    inference_threads, intra_op_threads, inter_op_threads = get_thread_settings()
+
+    torch.set_num_threads(intra_op_threads)
+    try:
+        torch.set_num_interop_threads(inter_op_threads)
+    except RuntimeError:
+        # Only settable before the first inter-op parallel work in the process
+        pass
+
+    if _inference_executor is None:
+        _inference_executor = ThreadPoolExecutor(
+            max_workers=inference_threads,
+            thread_name_prefix='inference',
+            initializer=torch.set_num_threads,
+            initargs=(intra_op_threads,)
+        )
+    print(f"Inference threads: {inference_threads} x {intra_op_threads} intra-op "
+          f"({inter_op_threads} inter-op)")
+
+
+def _serialized(func):
+    """Wrap a function with a lock (fast tokenizers are not safe to share across threads)"""
+    lock = threading.Lock()
+
+    def wrapper(*args, **kwargs):
+        with lock:
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _encode(texts, batch_size):
+    """
+    Run model.encode on one of the shared inference threads
+    
+    HTTP threads beyond config.INFERENCE_THREADS queue here instead of
+    oversubscribing the cores with extra torch work.
+    """
+    model = get_model()
+    return _inference_executor.submit(
+        model.encode,
+        texts,
+        convert_to_numpy=True,
+        show_progress_bar=False,
+        batch_size=batch_size
+    ).result()
+
+
+def get_model_load_seconds():
+    """
+    Get how long the last model load took
+    
+    Returns:
+        float: Load time in seconds, or None if the model is not loaded
+    """
+    return _model_load_seconds
+
+
+def _has_model_bundle(bundle_dir):
+    """Check that a bundle exists and was built for the configured model"""
+    info_path = os.path.join(bundle_dir, BUNDLE_INFO_FILE)
+    if not os.path.isfile(info_path):
+        return False
+
+    with open(info_path) as f:
+        bundled_name = json.load(f).get('model_name')
+    if bundled_name != config.MODEL_NAME:
+        print(f"Model bundle is for {bundled_name}, not {config.MODEL_NAME}; ignoring it")
+        return False
+    return True
+
+
+def _load_bundled_model(bundle_dir):
+    """
+    Load a model written by bundle_model.py
+    
+    The bundle holds safetensors weights plus the tokenizer and configs, so
+    loading reads local files only: no hub download, and no unpickling.
+    
+    Args:
+        bundle_dir: Bundle directory
+        
+    Returns:
+        SentenceTransformer: Loaded model
+    """
+    return SentenceTransformer(bundle_dir, device='cpu')
+
+
 @lru_cache(maxsize=16)
 def get_bert_embeddings_cached(text_hash):
     """
@@ -73,10 +215,8 @@ def get_bert_embeddings(text):
             text = text[:config.MAX_TEXT_LENGTH]
         
         # Generate embeddings (sentence-transformers handles tokenization internally)
-        embeddings = model.encode(
-            text, 
-            convert_to_numpy=True, 
-            show_progress_bar=False,
+        embeddings = _encode(
+            text,
             batch_size=1  # Process one at a time to minimize memory spike
         )
         
@@ -90,16 +230,54 @@ def get_bert_embeddings(text):
         raise
 
 
+def get_bert_embeddings_batch(texts, batch_size=None):
+    """
+    Generate embeddings for many texts in a single batched encode call
+    
+    Args:
+        texts: List of input text strings
+        batch_size: Encode batch size (defaults to config.EMBEDDINGS_BATCH_SIZE)
+        
+    Returns:
+        numpy.ndarray: Text embeddings, one row per input text
+    """
+    texts = [text[:config.MAX_TEXT_LENGTH] for text in texts]
+    
+    return _encode(texts, batch_size=batch_size or config.EMBEDDINGS_BATCH_SIZE)
+
+
+def count_tokens(texts):
+    """
+    Count the text tokens the model encodes for each text
+    
+    Counts exclude special tokens and are capped by the model's maximum
+    sequence length, like the encoder's own truncation.
+    
+    Args:
+        texts: List of input text strings
+        
+    Returns:
+        tuple: (list of token counts, maximum text tokens encoded per text)
+    """
+    model = get_model()
+    lengths = model.tokenize([''] + [text[:config.MAX_TEXT_LENGTH] for text in texts])['attention_mask'].sum(dim=1)
+    special_tokens = int(lengths[0])
+    counts = [max(0, int(length) - special_tokens) for length in lengths[1:]]
+    return counts, model.max_seq_length - special_tokens
+
+
 def clear_model():
     """
     Clear model from memory (for emergency memory management)
     """
-    global _model
-    if _model is not None:
-        del _model
-        _model = None
-        gc.collect()
-        print("Model cleared from memory")
+    global _model, _model_load_seconds
+    with _model_lock:
+        if _model is not None:
+            del _model
+            _model = None
+            _model_load_seconds = None
+            gc.collect()
+            print("Model cleared from memory")
 
 
 def preload_model():
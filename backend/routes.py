@@ -3,13 +3,23 @@ API routes for the application
 """
 import io
 import gc
+import hmac
 from datetime import datetime
 from flask import Blueprint, request, jsonify
 from config import get_config
-from utils import validate_pdf, extract_text_from_pdf, get_secure_filename, detect_experience_level
-from services import calculate_match_score, generate_analysis
+from utils import (
+    validate_pdf, extract_text_from_pdf, get_secure_filename, detect_experience_level,
+    extract_keywords, PayloadError, decompress_payload, parse_text_payload
+)
+from services import (
+    calculate_match_score, generate_analysis, get_job_index, find_matching_jobs,
+    create_session, save_session, get_session, submit_stage
+)
+from models import get_bert_embeddings
 
-config = get_config()# Create blueprint
+config = get_config()
+
+# Create blueprint
 api = Blueprint('api', __name__)
 
 
@@ -23,13 +33,14 @@ def home():
 def health_check():
     """Health check endpoint"""
     try:
-        from models import get_model
+        from models import get_model, get_model_load_seconds
         # Check if model is loaded
         model = get_model()
         return jsonify({
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
-            'model_loaded': True
+            'model_loaded': True,
+            'model_load_seconds': round(get_model_load_seconds(), 2)
         }), 200
     except Exception as e:
         print(f"Health check failed: {str(e)}")
@@ -39,6 +50,136 @@ def health_check():
         }), 503
 
 
+def _get_resume_file():
+    """
+    Get and validate the uploaded resume PDF
+    
+    Returns:
+        tuple: (FileStorage, None) or (None, error response)
+    """
+    if 'resume' not in request.files:
+        print("No resume file in request")
+        return None, (jsonify({'error': 'No resume file provided'}), 400)
+
+    resume_file = request.files['resume']
+    
+    # Validate filename
+    if resume_file.filename == '':
+        print("Empty filename")
+        return None, (jsonify({'error': 'No file selected'}), 400)
+    
+    if not validate_pdf(resume_file.filename):
+        print(f"Invalid file type: {resume_file.filename}")
+        return None, (jsonify({'error': 'Only PDF files are allowed'}), 400)
+    
+    return resume_file, None
+
+
+def _extract_resume_text(resume_file):
+    """
+    Extract text from an uploaded resume PDF
+    
+    Returns:
+        tuple: (resume_text, None) or (None, error response)
+    """
+    print(f"Processing resume: {get_secure_filename(resume_file.filename)}")
+    resume_text = extract_text_from_pdf(io.BytesIO(resume_file.read()))
+
+    if not resume_text:
+        print("Failed to extract text from PDF")
+        return None, (jsonify({
+            'error': 'Could not extract text from the resume PDF. The file might be empty, encrypted, image-based, or corrupted. Please ensure your PDF contains selectable text.'
+        }), 400)
+    
+    return resume_text, None
+
+
+def _get_text_payload():
+    """
+    Decode and verify a (possibly compressed) JSON payload of resume text
+    
+    Returns:
+        tuple: (payload dict, None) or (None, error response)
+    """
+    try:
+        data = decompress_payload(request.get_data(cache=False), request.content_encoding)
+        return parse_text_payload(data), None
+    except PayloadError as e:
+        print(f"Invalid text payload: {str(e)}")
+        return None, (jsonify({'error': str(e)}), e.status_code)
+
+
+def _get_resume_source():
+    """
+    Get the request fields and resume PDF, or a pre-extracted text payload
+    
+    Returns:
+        tuple: (fields, resume_file or None, None) or (None, None, error response)
+    """
+    if request.is_json or request.content_encoding:
+        # Pre-extracted text: no PDF upload or parsing
+        fields, error_response = _get_text_payload()
+        return fields, None, error_response
+    
+    resume_file, error_response = _get_resume_file()
+    return request.form, resume_file, error_response
+
+
+def _resolve_resume_text(fields, resume_file):
+    """
+    Get resume text from the uploaded PDF or the verified text payload
+    
+    Returns:
+        tuple: (resume_text, None) or (None, error response)
+    """
+    if resume_file is None:
+        resume_text = fields['resumeText']
+        print(f"Processing pre-extracted resume text ({len(resume_text)} chars)")
+        return resume_text, None
+    
+    return _extract_resume_text(resume_file)
+
+
+def _get_experience_level(fields):
+    """
+    Get the requested experience level, falling back to 'auto'
+    
+    Returns:
+        str: Experience level
+    """
+    experience_level = str(fields.get('experienceLevel') or 'auto').lower()
+    if experience_level not in config.VALID_EXPERIENCE_LEVELS:
+        print(f"Invalid experience level: {experience_level}")
+        experience_level = 'auto'
+    return experience_level
+
+
+def _validate_job_description(job_description):
+    """
+    Validate job description length
+    
+    Returns:
+        tuple: Error response, or None if valid
+    """
+    if not job_description:
+        print("No job description provided")
+        return jsonify({'error': 'No job description provided'}), 400
+    
+    if len(job_description) < config.MIN_JOB_DESCRIPTION_LENGTH:
+        print("Job description too short")
+        return jsonify({
+            'error': f'Job description must be at least {config.MIN_JOB_DESCRIPTION_LENGTH} characters'
+        }), 400
+    
+    if len(job_description) > config.MAX_JOB_DESCRIPTION_LENGTH:
+        print("Job description too long")
+        return jsonify({
+            'error': f'Job description must be less than {config.MAX_JOB_DESCRIPTION_LENGTH} characters'
+        }), 400
+    
+    return None
+
+
 @api.route('/analyze', methods=['POST'])
 def analyze_resume():
     """
@@ -48,62 +189,48 @@ def analyze_resume():
         - resume: PDF file
         - jobDescription: Text string
         - experienceLevel: 'auto', 'intern', 'fresher', or 'experienced' (optional)
+    
+    Alternatively, a JSON body (optionally gzip/zstd Content-Encoding) with
+    pre-extracted text:
+        - resumeText: Resume text string
+        - resumeTextHash: SHA-256 hex digest of resumeText
+        - jobDescription, experienceLevel: As above
         
     Returns:
         JSON with analysis results
     """
     start_time = datetime.now()
+    stages = []
     
     try:
-        # Validate file upload
-        if 'resume' not in request.files:
-            print("No resume file in request")
-            return jsonify({'error': 'No resume file provided'}), 400
-
-        resume_file = request.files['resume']
-        
-        # Validate filename
-        if resume_file.filename == '':
-            print("Empty filename")
-            return jsonify({'error': 'No file selected'}), 400
-        
-        if not validate_pdf(resume_file.filename):
-            print(f"Invalid file type: {resume_file.filename}")
-            return jsonify({'error': 'Only PDF files are allowed'}), 400
+        # Validate file upload (or pre-extracted text payload)
+        fields, resume_file, error_response = _get_resume_source()
+        if error_response:
+            return error_response
 
         # Validate job description
-        job_description = request.form.get('jobDescription', '').strip()
-        if not job_description:
-            print("No job description provided")
-            return jsonify({'error': 'No job description provided'}), 400
-        
-        if len(job_description) < config.MIN_JOB_DESCRIPTION_LENGTH:
-            print("Job description too short")
-            return jsonify({
-                'error': f'Job description must be at least {config.MIN_JOB_DESCRIPTION_LENGTH} characters'
-            }), 400
-        
-        if len(job_description) > config.MAX_JOB_DESCRIPTION_LENGTH:
-            print("Job description too long")
-            return jsonify({
-                'error': f'Job description must be less than {config.MAX_JOB_DESCRIPTION_LENGTH} characters'
-            }), 400
+        job_description = str(fields.get('jobDescription') or '').strip()
+        error_response = _validate_job_description(job_description)
+        if error_response:
+            return error_response
 
         # Get and validate experience level
-        experience_level = request.form.get('experienceLevel', 'auto').lower()
-        if experience_level not in config.VALID_EXPERIENCE_LEVELS:
-            print(f"Invalid experience level: {experience_level}")
-            experience_level = 'auto'
+        experience_level = _get_experience_level(fields)
+
+        # Job description stages don't need the resume: run them while the PDF is parsed
+        job_emb = submit_stage(get_bert_embeddings, job_description)
+        job_keywords = submit_stage(extract_keywords, job_description)
+        stages = [job_emb, job_keywords]
 
         # Extract text from PDF
-        print(f"Processing resume: {get_secure_filename(resume_file.filename)}")
-        resume_text = extract_text_from_pdf(io.BytesIO(resume_file.read()))
+        resume_text, error_response = _resolve_resume_text(fields, resume_file)
+        if error_response:
+            return error_response
 
-        if not resume_text:
-            print("Failed to extract text from PDF")
-            return jsonify({
-                'error': 'Could not extract text from the resume PDF. The file might be empty, encrypted, image-based, or corrupted. Please ensure your PDF contains selectable text.'
-            }), 400
+        # Resume keywords are extracted while the resume is encoded
+        resume_emb = submit_stage(get_bert_embeddings, resume_text)
+        resume_keywords = submit_stage(extract_keywords, resume_text)
+        stages += [resume_emb, resume_keywords]
 
         # Auto-detect experience level if not provided
         if experience_level == 'auto':
@@ -113,7 +240,9 @@ def analyze_resume():
         # Calculate match scores using BERT with experience level
         print("Calculating match scores...")
         match_score, skills_match, experience_match, keyword_match, common_keywords = calculate_match_score(
-            resume_text, job_description, experience_level
+            resume_text, job_description, experience_level,
+            resume_emb=resume_emb.result(), job_emb=job_emb.result(),
+            resume_keywords=resume_keywords.result(), job_keywords=job_keywords.result()
         )
         
         # Generate detailed analysis with experience level
@@ -141,3 +270,273 @@ def analyze_resume():
             'error': 'An unexpected error occurred during analysis. Please try again or contact support if the issue persists.',
             'details': str(e) if config.DEBUG else None
         }), 500
+
+    finally:
+        # Drop stages still queued; ones already running (usually job_emb) finish unused
+        for stage in stages:
+            stage.cancel()
+
+
+def _analyze_in_session(session, fields, resume_file, start_time):
+    """
+    Score a resume revision within an analysis session
+    
+    The session is saved only after a successful score, so a new session
+    whose first resume fails is never stored.
+    
+    Returns:
+        tuple: JSON response and status code
+    """
+    experience_level = _get_experience_level(fields)
+    
+    resume_text, error_response = _resolve_resume_text(fields, resume_file)
+    if error_response:
+        return error_response
+    
+    if experience_level == 'auto':
+        experience_level = detect_experience_level(resume_text)
+        print(f"Auto-detected experience level: {experience_level}")
+    
+    print("Calculating match scores (incremental)...")
+    (match_score, skills_match, experience_match, keyword_match, common_keywords), stats = session.score(
+        resume_text, experience_level
+    )
+    print(f"Re-encoded {stats['encodedChunks']}/{stats['chunks']} resume chunks")
+    save_session(session)
+    
+    analysis_result = generate_analysis(
+        match_score, skills_match, experience_match, keyword_match,
+        common_keywords, resume_text, session.job_description, experience_level
+    )
+    
+    processing_time = (datetime.now() - start_time).total_seconds()
+    print(f"Session analysis completed in {processing_time:.2f} seconds")
+    analysis_result['processingTime'] = round(processing_time, 2)
+    analysis_result['sessionId'] = session.session_id
+    # Chunked scoring differs slightly from /analyze; compare only within a session
+    analysis_result['approximate'] = True
+    analysis_result['chunks'] = stats['chunks']
+    analysis_result['encodedChunks'] = stats['encodedChunks']
+    
+    return jsonify(analysis_result), 200
+
+
+@api.route('/sessions', methods=['POST'])
+def create_analysis_session():
+    """
+    Start an analysis session and score the first resume revision
+    
+    Accepts the same form data or JSON payload as /analyze. The returned
+    sessionId is used to re-score later revisions against the same job.
+    
+    Returns:
+        JSON with analysis results and sessionId
+    """
+    start_time = datetime.now()
+    
+    try:
+        fields, resume_file, error_response = _get_resume_source()
+        if error_response:
+            return error_response
+        
+        job_description = str(fields.get('jobDescription') or '').strip()
+        error_response = _validate_job_description(job_description)
+        if error_response:
+            return error_response
+        
+        session = create_session(job_description)
+        print(f"Starting analysis session: {session.session_id}")
+        
+        return _analyze_in_session(session, fields, resume_file, start_time)
+
+    except Exception as e:
+        print(f"Error during session analysis: {str(e)}")
+        gc.collect()
+        return jsonify({
+            'error': 'An unexpected error occurred during analysis. Please try again or contact support if the issue persists.',
+            'details': str(e) if config.DEBUG else None
+        }), 500
+
+
+@api.route('/sessions/<session_id>', methods=['POST'])
+def rescore_analysis_session(session_id):
+    """
+    Re-score an edited resume against the session's job description
+    
+    Accepts a resume PDF or JSON text payload (as /analyze) and an optional
+    experienceLevel; the job description is taken from the session.
+    
+    Returns:
+        JSON with analysis results, or 404 if the session expired
+    """
+    start_time = datetime.now()
+    
+    try:
+        session = get_session(session_id)
+        if session is None:
+            print(f"Unknown or expired session: {session_id}")
+            return jsonify({'error': 'Session not found or expired'}), 404
+        
+        fields, resume_file, error_response = _get_resume_source()
+        if error_response:
+            return error_response
+        
+        return _analyze_in_session(session, fields, resume_file, start_time)
+
+    except Exception as e:
+        print(f"Error during session analysis: {str(e)}")
+        gc.collect()
+        return jsonify({
+            'error': 'An unexpected error occurred during analysis. Please try again or contact support if the issue persists.',
+            'details': str(e) if config.DEBUG else None
+        }), 500
+
+
+def _check_job_admin():
+    """
+    Require the job admin token (Authorization: Bearer <JOB_ADMIN_TOKEN>)
+    
+    Returns:
+        tuple: Error response, or None if authorized
+    """
+    if not config.JOB_ADMIN_TOKEN:
+        return jsonify({'error': 'Job indexing is disabled'}), 403
+    
+    auth = request.headers.get('Authorization', '')
+    token = auth[len('Bearer '):] if auth.startswith('Bearer ') else ''
+    if not hmac.compare_digest(token.encode('utf-8'), config.JOB_ADMIN_TOKEN.encode('utf-8')):
+        print("Rejected job index request: invalid admin token")
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    return None
+
+
+@api.route('/jobs', methods=['POST'])
+def add_job():
+    """
+    Add or replace a job posting in the job index (admin token required)
+    
+    Expected JSON body:
+        - id: Unique job identifier
+        - description: Job description text
+        - title: Job title (optional)
+        
+    Returns:
+        JSON with the stored job id and index size
+    """
+    error_response = _check_job_admin()
+    if error_response:
+        return error_response
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        job_id = str(data.get('id', '')).strip()
+        if not job_id:
+            return jsonify({'error': 'No job id provided'}), 400
+        
+        job_description = str(data.get('description', '')).strip()
+        error_response = _validate_job_description(job_description)
+        if error_response:
+            return error_response
+        
+        index = get_job_index()
+        index.add(job_id, job_description, title=str(data.get('title', '')).strip())
+        print(f"Indexed job: {job_id}")
+        
+        return jsonify({'id': job_id, 'jobCount': len(index)}), 200
+
+    except Exception as e:
+        print(f"Error indexing job: {str(e)}")
+        return jsonify({
+            'error': 'An unexpected error occurred while indexing the job.',
+            'details': str(e) if config.DEBUG else None
+        }), 500
+
+
+@api.route('/jobs/<job_id>', methods=['DELETE'])
+def remove_job(job_id):
+    """
+    Remove a job posting from the job index (admin token required)
+    
+    Returns:
+        JSON with the removed job id and index size
+    """
+    error_response = _check_job_admin()
+    if error_response:
+        return error_response
+    
+    try:
+        index = get_job_index()
+        if not index.remove(job_id):
+            return jsonify({'error': 'Job not found'}), 404
+        
+        print(f"Removed job: {job_id}")
+        return jsonify({'id': job_id, 'jobCount': len(index)}), 200
+
+    except Exception as e:
+        print(f"Error removing job: {str(e)}")
+        return jsonify({
+            'error': 'An unexpected error occurred while removing the job.',
+            'details': str(e) if config.DEBUG else None
+        }), 500
+
+
+@api.route('/match-jobs', methods=['POST'])
+def match_jobs():
+    """
+    Find the indexed jobs that best fit a resume
+    
+    Expected form data:
+        - resume: PDF file
+        - topK: Number of jobs to return (optional)
+        - rerank: 'false' to skip keyword re-ranking (optional)
+        - experienceLevel: 'auto', 'intern', 'fresher', or 'experienced' (optional)
+        
+    Returns:
+        JSON with ranked job matches
+    """
+    start_time = datetime.now()
+    
+    try:
+        resume_file, error_response = _get_resume_file()
+        if error_response:
+            return error_response
+        
+        try:
+            top_k = int(request.form.get('topK', config.JOB_MATCH_DEFAULT_TOP_K))
+        except ValueError:
+            return jsonify({'error': 'topK must be an integer'}), 400
+        top_k = max(1, min(top_k, config.JOB_MATCH_MAX_TOP_K))
+        rerank = request.form.get('rerank', 'true').lower() != 'false'
+        
+        experience_level = _get_experience_level(request.form)
+        
+        resume_text, error_response = _extract_resume_text(resume_file)
+        if error_response:
+            return error_response
+        
+        if experience_level == 'auto':
+            experience_level = detect_experience_level(resume_text)
+            print(f"Auto-detected experience level: {experience_level}")
+        
+        print("Searching job index...")
+        matches = find_matching_jobs(resume_text, experience_level, top_k, rerank=rerank)
+        
+        processing_time = (datetime.now() - start_time).total_seconds()
+        print(f"Job matching completed in {processing_time:.2f} seconds")
+        
+        gc.collect()
+        
+        return jsonify({
+            'experienceLevel': experience_level,
+            'matches': matches,
+            'processingTime': round(processing_time, 2)
+        }), 200
+
+    except Exception as e:
+        print(f"Error during job matching: {str(e)}")
+        gc.collect()
+        return jsonify({
+            'error': 'An unexpected error occurred during job matching. Please try again or contact support if the issue persists.',
+            'details': str(e) if config.DEBUG else None
+        }), 500
@@ -1,6 +1,22 @@
 """
 Initialize services package
 """
-from .analyzer import calculate_match_score, generate_analysis
+from .analyzer import calculate_match_score, calculate_keyword_match, combine_match_scores, generate_analysis
+from .keyword_engine import KeywordMatchEngine
+from .job_index import get_job_index, find_matching_jobs
+from .session import create_session, save_session, get_session
+from .pipeline import submit_stage
 
-__all__ = ['calculate_match_score', 'generate_analysis']
+__all__ = [
+    'calculate_match_score',
+    'calculate_keyword_match',
+    'combine_match_scores',
+    'generate_analysis',
+    'KeywordMatchEngine',
+    'get_job_index',
+    'find_matching_jobs',
+    'create_session',
+    'save_session',
+    'get_session',
+    'submit_stage'
+]
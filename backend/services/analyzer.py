@@ -6,7 +6,8 @@ from models import get_bert_embeddings
 from utils import extract_keywords
 
 
-def calculate_match_score(resume_text, job_description, experience_level='auto'):
+def calculate_match_score(resume_text, job_description, experience_level='auto',
+                          resume_emb=None, job_emb=None, resume_keywords=None, job_keywords=None):
     """
     Calculate match scores between resume and job description with improved algorithm
     
@@ -14,25 +15,49 @@ def calculate_match_score(resume_text, job_description, experience_level='auto')
         resume_text: Resume text string
         job_description: Job description text string
         experience_level: Experience level ('intern', 'fresher', 'experienced', or 'auto')
+        resume_emb: Precomputed resume embedding (optional, 2D array)
+        job_emb: Precomputed job description embedding (optional, 2D array)
+        resume_keywords: Precomputed extract_keywords output for the resume (optional)
+        job_keywords: Precomputed extract_keywords output for the job description (optional)
         
     Returns:
         tuple: (match_score, skills_match, experience_match, keyword_match_percent, common_keywords)
     """
-    # Get embeddings
-    resume_emb = get_bert_embeddings(resume_text)
-    job_emb = get_bert_embeddings(job_description)
+    # Get embeddings (callers scoring in bulk pass batched embeddings in)
+    if resume_emb is None:
+        resume_emb = get_bert_embeddings(resume_text)
+    if job_emb is None:
+        job_emb = get_bert_embeddings(job_description)
     
     # Calculate semantic similarity (0 to 1)
     semantic_similarity = cosine_similarity(resume_emb, job_emb)[0][0]
     
-    # Improved boosting formula - more generous and realistic
-    # Scale from [0.3-0.9] to [0.45-0.92] to account for model behavior
-    boosted_similarity = min(0.95, max(0.40, semantic_similarity * 1.15 + 0.12))
-    
     # Extract keywords with enhanced extraction
-    resume_keywords = extract_keywords(resume_text)
-    job_keywords = extract_keywords(job_description)
+    if resume_keywords is None:
+        resume_keywords = extract_keywords(resume_text)
+    if job_keywords is None:
+        job_keywords = extract_keywords(job_description)
+    
+    keyword_match, common_keywords = calculate_keyword_match(resume_keywords, job_keywords)
+    
+    match_score, skills_match, experience_match, keyword_match_percent = combine_match_scores(
+        semantic_similarity, keyword_match, experience_level
+    )
+    
+    return match_score, skills_match, experience_match, keyword_match_percent, common_keywords
+
+
+def calculate_keyword_match(resume_keywords, job_keywords):
+    """
+    Calculate keyword match with exact, substring and character-level fuzzy matching
     
+    Args:
+        resume_keywords: Set of resume keywords
+        job_keywords: Set of job description keywords
+        
+    Returns:
+        tuple: (keyword_match (0 to 1), common_keywords)
+    """
     # Calculate keyword match with improved fuzzy matching
     common_keywords = resume_keywords.intersection(job_keywords)
     
@@ -62,6 +87,29 @@ def calculate_match_score(resume_text, job_description, experience_level='auto')
     fuzzy_bonus = (sum(similarity_scores) / len(job_keywords)) * 0.15 if similarity_scores and len(job_keywords) > 0 else 0
     keyword_match = min(1.0, base_match + fuzzy_bonus)
     
+    return keyword_match, common_keywords
+
+
+def combine_match_scores(semantic_similarity, keyword_match, experience_level='auto'):
+    """
+    Combine semantic similarity and keyword match into the reported scores
+    
+    Args:
+        semantic_similarity: Cosine similarity of resume and job embeddings
+        keyword_match: Keyword match (0 to 1) from calculate_keyword_match
+        experience_level: Experience level ('intern', 'fresher', 'experienced', or 'auto')
+        
+    Returns:
+        tuple: (match_score, skills_match, experience_match, keyword_match_percent)
+    """
+    # Canonical precision, so equal matches computed with a different float
+    # summation order (e.g. KeywordMatchEngine) truncate to the same percentages
+    keyword_match = round(float(keyword_match), 9)
+    
+    # Improved boosting formula - more generous and realistic
+    # Scale from [0.3-0.9] to [0.45-0.92] to account for model behavior
+    boosted_similarity = min(0.95, max(0.40, semantic_similarity * 1.15 + 0.12))
+    
     # Adjust weights based on experience level
     if experience_level == 'intern':
         # For interns: prioritize projects and skills (70% combined)
@@ -104,7 +152,7 @@ def calculate_match_score(resume_text, job_description, experience_level='auto')
     if keyword_match > 0.25 and boosted_similarity > 0.50:
         match_score = max(match_score, 55)
     
-    return match_score, skills_match, experience_match, keyword_match_percent, common_keywords
+    return match_score, skills_match, experience_match, keyword_match_percent
 
 
 def generate_analysis(match_score, skills_match, experience_match, keyword_match, 
@@ -0,0 +1,430 @@
+"""
+Job corpus index for reverse matching (resume -> top-k jobs)
+"""
+import os
+import json
+import fcntl
+import threading
+from contextlib import contextmanager
+import numpy as np
+from config import get_config
+from models import get_bert_embeddings
+from utils import extract_keywords
+from .analyzer import calculate_match_score
+
+config = get_config()
+
+# Global variable for index caching
+_index = None
+_index_lock = threading.Lock()
+
+
+class JobIndex:
+    """
+    Memory-mapped matrix of normalized job description embeddings
+
+    Rows are stored as float16, or as int8 with a per-row scale. Job metadata
+    (title, description, keyword set) lives in an append-only log next to the
+    matrix. Removing a job frees its row for the next add, so the index is
+    updated in place and never rebuilt.
+
+    Several processes (gunicorn workers) can share one index directory. Every
+    operation holds an flock on the directory's lock file, exclusive for adds
+    and removes, and first replays log records and header changes written by
+    other processes since its last call.
+    """
+
+    def __init__(self, path, dtype='float16', block_size=4096):
+        if dtype not in ('float16', 'int8'):
+            raise ValueError(f"Unsupported job index dtype: {dtype}")
+
+        self.path = path
+        self.block_size = block_size
+        self._lock = threading.RLock()
+        self._header_path = os.path.join(path, 'header.json')
+        self._log_path = os.path.join(path, 'jobs.jsonl')
+        self._matrix_path = os.path.join(path, 'embeddings.bin')
+        self._scales_path = os.path.join(path, 'scales.bin')
+        self._lock_path = os.path.join(path, 'index.lock')
+
+        os.makedirs(path, exist_ok=True)
+        self._header = {'dtype': dtype, 'dim': None, 'capacity': 0}
+        self._jobs = {}  # job_id -> {'row', 'title', 'description', 'keywords'}
+        self._row_ids = {}  # row -> job_id
+        self._size = 0  # Rows in use or freed (high-water mark)
+        self._log_offset = 0  # Bytes of the log already replayed
+        self._matrix = None
+        self._scales = None
+        self._active = np.zeros(0, dtype=bool)
+
+        with self._locked(exclusive=False):
+            if self._header['dtype'] != dtype:
+                print(f"Job index at {path} uses {self._header['dtype']}, ignoring configured {dtype}")
+
+    @property
+    def dtype(self):
+        return self._header['dtype']
+
+    def __len__(self):
+        with self._locked(exclusive=False):
+            return len(self._jobs)
+
+    @contextmanager
+    def _locked(self, exclusive):
+        """
+        Hold the thread lock and the cross-process file lock, in sync with disk
+
+        The lock file is opened per call so that processes forked after the
+        index was opened never share a lock.
+        """
+        with self._lock:
+            with open(self._lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    self._sync()
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _sync(self):
+        """Pick up capacity growth and log records written by other processes"""
+        if os.path.exists(self._header_path):
+            with open(self._header_path) as f:
+                header = json.load(f)
+            if header != self._header:
+                self._header = header
+                self._matrix = None
+                self._scales = None
+                self._open_matrix()
+        if len(self._active) < self._header['capacity']:
+            active = np.zeros(self._header['capacity'], dtype=bool)
+            active[:len(self._active)] = self._active
+            self._active = active
+        self._replay_log()
+
+    def _replay_log(self):
+        """Apply metadata log records not yet seen by this process"""
+        if not os.path.exists(self._log_path):
+            return
+
+        with open(self._log_path, 'rb') as f:
+            f.seek(self._log_offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Partial last line from an interrupted write
+                    break
+                self._log_offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record['op'] == 'add':
+                    self._set_job(record['id'], record['row'], record)
+                elif record['op'] == 'remove':
+                    self._unset_job(record['id'])
+
+    def _set_job(self, job_id, row, record):
+        self._unset_job(job_id)
+        self._jobs[job_id] = {
+            'row': row,
+            'title': record.get('title', ''),
+            'description': record['description'],
+            'keywords': set(record['keywords'])
+        }
+        self._row_ids[row] = job_id
+        self._size = max(self._size, row + 1)
+        if row < len(self._active):
+            self._active[row] = True
+
+    def _unset_job(self, job_id):
+        job = self._jobs.pop(job_id, None)
+        if job is not None:
+            self._row_ids.pop(job['row'], None)
+            if job['row'] < len(self._active):
+                self._active[job['row']] = False
+
+    def _append_log(self, record):
+        """Append a record (exclusive lock held, log already replayed)"""
+        with open(self._log_path, 'ab') as f:
+            if f.tell() > self._log_offset:
+                # Keep the record off a line truncated by an interrupted write
+                f.write(b'\n')
+            f.write((json.dumps(record) + '\n').encode('utf-8'))
+            self._log_offset = f.tell()
+
+    def _write_header(self):
+        tmp_path = self._header_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._header, f)
+        os.replace(tmp_path, self._header_path)
+
+    def _open_matrix(self):
+        """Map the embedding (and scale) files at the current capacity"""
+        capacity, dim = self._header['capacity'], self._header['dim']
+        if not capacity:
+            return
+
+        self._matrix = np.memmap(self._matrix_path, dtype=self.dtype, mode='r+', shape=(capacity, dim))
+        if self.dtype == 'int8':
+            self._scales = np.memmap(self._scales_path, dtype=np.float32, mode='r+', shape=(capacity,))
+
+    def _ensure_capacity(self, rows, dim):
+        """Grow the backing files in place so that `rows` rows fit"""
+        if self._header['dim'] is None:
+            self._header['dim'] = dim
+        elif self._header['dim'] != dim:
+            raise ValueError(f"Embedding dimension {dim} does not match index dimension {self._header['dim']}")
+
+        capacity = self._header['capacity']
+        if rows <= capacity:
+            return
+
+        new_capacity = max(capacity * 2, config.JOB_INDEX_INITIAL_CAPACITY, rows)
+        if self._matrix is not None:
+            self._matrix.flush()
+            if self._scales is not None:
+                self._scales.flush()
+        self._matrix = None
+        self._scales = None
+
+        itemsize = np.dtype(self.dtype).itemsize
+        _resize_file(self._matrix_path, new_capacity * dim * itemsize)
+        if self.dtype == 'int8':
+            _resize_file(self._scales_path, new_capacity * np.dtype(np.float32).itemsize)
+
+        active = np.zeros(new_capacity, dtype=bool)
+        active[:len(self._active)] = self._active
+        self._active = active
+        self._header['capacity'] = new_capacity
+        self._write_header()
+        self._open_matrix()
+
+    def _free_row(self):
+        """Return the first freed row, or the next unused one"""
+        free_rows = np.flatnonzero(~self._active[:self._size])
+        return int(free_rows[0]) if len(free_rows) else self._size
+
+    def _encode_row(self, embedding):
+        """Normalize an embedding and quantize it to the index dtype"""
+        embedding = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(embedding)
+        if norm > 0:
+            embedding = embedding / norm
+
+        if self.dtype == 'int8':
+            scale = float(np.abs(embedding).max()) / 127.0 or 1.0
+            return np.round(embedding / scale).astype(np.int8), scale
+        return embedding.astype(np.float16), 1.0
+
+    def add(self, job_id, description, title='', embedding=None):
+        """
+        Add or replace a job in the index
+
+        Args:
+            job_id: Unique job identifier
+            description: Job description text
+            title: Optional job title
+            embedding: Precomputed description embedding (computed if omitted)
+        """
+        if embedding is None:
+            embedding = get_bert_embeddings(description)
+        keywords = extract_keywords(description)
+        row_values, scale = self._encode_row(embedding)
+
+        with self._locked(exclusive=True):
+            existing = self._jobs.get(job_id)
+            row = existing['row'] if existing else self._free_row()
+            self._ensure_capacity(row + 1, len(row_values))
+
+            self._matrix[row] = row_values
+            self._matrix.flush()
+            if self._scales is not None:
+                self._scales[row] = scale
+                self._scales.flush()
+
+            record = {
+                'op': 'add',
+                'id': job_id,
+                'row': row,
+                'title': title,
+                'description': description,
+                'keywords': sorted(keywords)
+            }
+            self._append_log(record)
+            self._set_job(job_id, row, record)
+
+    def remove(self, job_id):
+        """
+        Remove a job from the index
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            bool: True if the job was present
+        """
+        with self._locked(exclusive=True):
+            if job_id not in self._jobs:
+                return False
+            self._append_log({'op': 'remove', 'id': job_id})
+            self._unset_job(job_id)
+            return True
+
+    def get_job(self, job_id):
+        """
+        Get stored metadata for a job
+
+        Returns:
+            dict: {'row', 'title', 'description', 'keywords'} or None
+        """
+        with self._locked(exclusive=False):
+            return self._jobs.get(job_id)
+
+    def get_embedding(self, job_id):
+        """
+        Get the (dequantized, normalized) embedding of a job
+
+        Returns:
+            numpy.ndarray: Embedding (2D array)
+        """
+        with self._locked(exclusive=False):
+            return self._row_embedding(self._jobs[job_id]['row'])
+
+    def _row_embedding(self, row):
+        """Dequantized embedding of a row (lock held)"""
+        embedding = np.asarray(self._matrix[row], dtype=np.float32)
+        if self._scales is not None:
+            embedding = embedding * self._scales[row]
+        return embedding.reshape(1, -1)
+
+    def search(self, query_embedding, top_k, include_jobs=False):
+        """
+        Find the jobs most similar to a query embedding
+
+        Scores are computed block by block with one matrix-vector product per
+        block, keeping only the running top-k between blocks.
+
+        Args:
+            query_embedding: Query embedding (1D or 2D array)
+            top_k: Number of results
+            include_jobs: Also return each job's metadata and embedding, read
+                under the same lock as the search (consistent even if another
+                worker removes the job right after)
+
+        Returns:
+            list: (job_id, cosine_similarity) tuples, or
+                (job_id, cosine_similarity, job, embedding) with include_jobs, best first
+        """
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        with self._locked(exclusive=False):
+            if not self._jobs or top_k <= 0:
+                return []
+
+            best_scores = np.empty(0, dtype=np.float32)
+            best_rows = np.empty(0, dtype=np.int64)
+            for start in range(0, self._size, self.block_size):
+                end = min(self._size, start + self.block_size)
+                scores = np.asarray(self._matrix[start:end], dtype=np.float32) @ query
+                if self._scales is not None:
+                    scores *= self._scales[start:end]
+                scores[~self._active[start:end]] = -np.inf
+
+                best_scores = np.concatenate([best_scores, scores])
+                best_rows = np.concatenate([best_rows, np.arange(start, end)])
+                if len(best_scores) > top_k:
+                    keep = np.argpartition(-best_scores, top_k - 1)[:top_k]
+                    best_scores, best_rows = best_scores[keep], best_rows[keep]
+
+            results = []
+            for i in np.argsort(-best_scores):
+                if not np.isfinite(best_scores[i]):
+                    continue
+                row = int(best_rows[i])
+                job_id = self._row_ids[row]
+                if include_jobs:
+                    results.append((job_id, float(best_scores[i]), self._jobs[job_id], self._row_embedding(row)))
+                else:
+                    results.append((job_id, float(best_scores[i])))
+            return results
+
+
+def _resize_file(path, size):
+    """Extend (or create) a file to the given byte size without rewriting it"""
+    with open(path, 'ab') as f:
+        f.truncate(size)
+
+
+def get_job_index():
+    """
+    Get the shared job index, opening it on first use
+
+    Returns:
+        JobIndex: Job corpus index
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = JobIndex(
+                    config.JOB_INDEX_DIR,
+                    dtype=config.JOB_INDEX_DTYPE,
+                    block_size=config.JOB_INDEX_BLOCK_SIZE
+                )
+                print(f"Job index opened with {len(_index)} jobs")
+    return _index
+
+
+def find_matching_jobs(resume_text, experience_level, top_k, rerank=True):
+    """
+    Find the best-fitting indexed jobs for a resume
+
+    The resume is embedded once and scored against every job with blocked
+    matrix products. With re-ranking, the top candidates are re-scored with
+    calculate_match_score using the stored embeddings and keyword sets.
+
+    Args:
+        resume_text: Resume text string
+        experience_level: Experience level ('intern', 'fresher', 'experienced')
+        top_k: Number of jobs to return
+        rerank: Re-rank candidates with keyword-aware match scores
+
+    Returns:
+        list: Job match dicts, best first
+    """
+    index = get_job_index()
+    resume_emb = get_bert_embeddings(resume_text)
+    # One locked pass: metadata and embeddings stay consistent with the scores
+    candidates = index.search(
+        resume_emb, top_k * config.JOB_MATCH_RERANK_FACTOR if rerank else top_k, include_jobs=True
+    )
+
+    resume_keywords = extract_keywords(resume_text) if rerank else None
+    results = []
+    for job_id, similarity, job, job_emb in candidates:
+        if not rerank:
+            results.append({'jobId': job_id, 'title': job['title'], 'similarity': round(similarity, 4)})
+            continue
+
+        match_score, skills_match, experience_match, keyword_match, common_keywords = calculate_match_score(
+            resume_text, job['description'], experience_level,
+            resume_emb=resume_emb, job_emb=job_emb,
+            resume_keywords=resume_keywords, job_keywords=job['keywords']
+        )
+        results.append({
+            'jobId': job_id,
+            'title': job['title'],
+            'similarity': round(similarity, 4),
+            'matchScore': match_score,
+            'skillsMatchPercent': skills_match,
+            'experienceMatchPercent': experience_match,
+            'keywordMatchPercent': keyword_match,
+            'commonKeywords': sorted(common_keywords)[:20]
+        })
+
+    if rerank:
+        results.sort(key=lambda r: (r['matchScore'], r['similarity']), reverse=True)
+    return results[:top_k]
@@ -0,0 +1,258 @@
+"""
+Sparse-matrix keyword scoring for many resumes x many jobs
+"""
+from collections import defaultdict
+import numpy as np
+from scipy import sparse
+
+# Characters are counted per ASCII code; extract_keywords only emits ASCII
+_ALPHABET_SIZE = 128
+
+
+def _char_counts(term):
+    """Count vector of a term's characters (None if it has non-ASCII characters)"""
+    counts = np.zeros(_ALPHABET_SIZE, dtype=np.float64)
+    for c in term:
+        code = ord(c)
+        if code >= _ALPHABET_SIZE:
+            return None
+        counts[code] += 1
+    return counts
+
+
+def _substrings(term, min_length=4):
+    """All distinct substrings of at least min_length characters"""
+    return {
+        term[i:j]
+        for i in range(len(term))
+        for j in range(i + min_length, len(term) + 1)
+    }
+
+
+def _char_similarity(jk, rk):
+    """Character-level similarity exactly as calculate_keyword_match computes it"""
+    common_chars = sum(1 for c in jk if c in rk)
+    return common_chars / max(len(jk), len(rk))
+
+
+class KeywordMatchResult:
+    """Keyword match scores for every resume x job pair"""
+
+    def __init__(self, engine, keyword_match, covered):
+        self.keyword_match = keyword_match  # (resumes x jobs) array, 0 to 1
+        self._engine = engine
+        self._covered = covered  # (resumes x job terms) CSR, 1 where a job term is matched
+
+    def common_keywords(self, resume_idx, job_idx):
+        """
+        Job keywords matched (exactly or fuzzily) by a resume
+
+        Returns:
+            set: Same set as calculate_keyword_match's common_keywords
+        """
+        covered = set(self._covered.indices[self._covered.indptr[resume_idx]:self._covered.indptr[resume_idx + 1]])
+        job_row = self._engine.job_matrix
+        job_terms = job_row.indices[job_row.indptr[job_idx]:job_row.indptr[job_idx + 1]]
+        return {self._engine.job_terms[t] for t in job_terms if t in covered}
+
+
+class KeywordMatchEngine:
+    """
+    Vocabulary-indexed keyword overlap between a fixed set of jobs and resumes
+
+    Job keyword sets become a CSR term matrix J (jobs x job terms). Each resume
+    term gets a column in two sparse job-term x resume-term matrices, computed
+    once per term rather than once per pair:
+        W: the partial-match score calculate_keyword_match gives the pair
+           (0.9 for substrings, 0.8 x character similarity for near matches)
+        A: 1 where the job term counts as matched (exact or partial)
+    For a resume term matrix R, every pair's keyword match then comes from
+    sparse products: the fuzzy score sum is R W^T J^T, and the matched job
+    term count is binarize(R A^T) J^T. Results equal calculate_keyword_match
+    up to floating-point summation order.
+    """
+
+    def __init__(self, job_keywords):
+        """
+        Args:
+            job_keywords: List of extract_keywords sets, one per job
+        """
+        self.job_terms = sorted(set().union(*job_keywords)) if job_keywords else []
+        self._job_index = {term: i for i, term in enumerate(self.job_terms)}
+        self.job_matrix = self._term_matrix(job_keywords, self._job_index, len(self.job_terms))
+        self.job_sizes = np.diff(self.job_matrix.indptr).astype(np.float64)
+
+        # Job terms longer than 3 characters, indexed by their substrings
+        self._job_substrings = defaultdict(list)
+        for i, term in enumerate(self.job_terms):
+            if len(term) > 3:
+                for substring in _substrings(term):
+                    self._job_substrings[substring].append(i)
+
+        # Character counts of job terms eligible for character similarity
+        self._fuzzy_job_ids = []
+        fuzzy_counts = []
+        self._ascii_fallback_job_ids = []
+        for i, term in enumerate(self.job_terms):
+            if len(term) > 4:
+                counts = _char_counts(term)
+                if counts is None:
+                    self._ascii_fallback_job_ids.append(i)
+                else:
+                    self._fuzzy_job_ids.append(i)
+                    fuzzy_counts.append(counts)
+        self._fuzzy_job_ids = np.array(self._fuzzy_job_ids, dtype=np.int64)
+        self._fuzzy_job_counts = np.vstack(fuzzy_counts) if fuzzy_counts else np.zeros((0, _ALPHABET_SIZE))
+        self._fuzzy_job_lengths = np.array([len(self.job_terms[i]) for i in self._fuzzy_job_ids], dtype=np.float64)
+
+        # Resume term columns, grown as new terms are seen
+        self._resume_index = {}
+        self._entries = ([], [], [])  # (job term, resume term, score) for W
+        self._matched = ([], [])  # (job term, resume term) for A
+        self._weights = None
+        self._adjacency = None
+
+    @staticmethod
+    def _term_matrix(keyword_sets, index, n_terms):
+        """Binary CSR matrix with one row per keyword set"""
+        indptr = [0]
+        indices = []
+        for keywords in keyword_sets:
+            indices.extend(sorted(index[term] for term in keywords if term in index))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float64)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(keyword_sets), n_terms))
+
+    def _add_resume_terms(self, terms):
+        """Compute W and A columns for resume terms not seen before"""
+        new_terms = [term for term in dict.fromkeys(terms) if term not in self._resume_index]
+        if not new_terms:
+            return
+
+        w_rows, w_cols, w_vals = self._entries
+        a_rows, a_cols = self._matched
+        fuzzy_terms = []
+        fuzzy_cols = []
+        for term in new_terms:
+            col = len(self._resume_index)
+            self._resume_index[term] = col
+            substring_matches = set()
+
+            exact = self._job_index.get(term)
+            if exact is not None:
+                a_rows.append(exact)
+                a_cols.append(col)
+
+            if len(term) > 3:
+                # Job terms inside the resume term, and job terms containing it
+                for substring in _substrings(term):
+                    job_id = self._job_index.get(substring)
+                    if job_id is not None:
+                        substring_matches.add(job_id)
+                substring_matches.update(self._job_substrings.get(term, ()))
+                for job_id in substring_matches:
+                    w_rows.append(job_id)
+                    w_cols.append(col)
+                    w_vals.append(0.9)
+                    if job_id != exact:
+                        a_rows.append(job_id)
+                        a_cols.append(col)
+
+            if len(term) > 4:
+                fuzzy_terms.append((term, substring_matches))
+                fuzzy_cols.append(col)
+
+        self._add_fuzzy_entries(fuzzy_terms, fuzzy_cols)
+        self._weights = None
+        self._adjacency = None
+
+    def _add_fuzzy_entries(self, fuzzy_terms, fuzzy_cols):
+        """Character-similarity entries for new resume terms longer than 4 characters"""
+        w_rows, w_cols, w_vals = self._entries
+        a_rows, a_cols = self._matched
+
+        def add(job_id, col, term, substring_matches):
+            if job_id in substring_matches:
+                return
+            similarity = _char_similarity(self.job_terms[job_id], term)
+            if similarity > 0.7:
+                w_rows.append(job_id)
+                w_cols.append(col)
+                w_vals.append(similarity * 0.8)
+                if self.job_terms[job_id] != term:
+                    a_rows.append(job_id)
+                    a_cols.append(col)
+
+        for (term, substring_matches), col in zip(fuzzy_terms, fuzzy_cols):
+            for job_id in self._ascii_fallback_job_ids:
+                add(job_id, col, term, substring_matches)
+
+        if not len(self._fuzzy_job_ids):
+            return
+
+        presence = []
+        for term, substring_matches in fuzzy_terms:
+            counts = _char_counts(term)
+            presence.append(None if counts is None else (counts > 0).astype(np.float64))
+
+        for (term, substring_matches), col, present in zip(fuzzy_terms, fuzzy_cols, presence):
+            if present is None:
+                for job_id in self._fuzzy_job_ids:
+                    add(int(job_id), col, term, substring_matches)
+                continue
+
+            # Common characters of every job term in this resume term
+            common_chars = self._fuzzy_job_counts @ present
+            similarity = common_chars / np.maximum(self._fuzzy_job_lengths, len(term))
+            for k in np.flatnonzero(similarity > 0.7):
+                job_id = int(self._fuzzy_job_ids[k])
+                if job_id in substring_matches:
+                    continue
+                w_rows.append(job_id)
+                w_cols.append(col)
+                w_vals.append(float(similarity[k]) * 0.8)
+                if self.job_terms[job_id] != term:
+                    a_rows.append(job_id)
+                    a_cols.append(col)
+
+    def _matrices(self):
+        """Build (or reuse) the W and A CSR matrices"""
+        if self._weights is None:
+            shape = (len(self.job_terms), len(self._resume_index))
+            w_rows, w_cols, w_vals = self._entries
+            self._weights = sparse.csr_matrix((w_vals, (w_rows, w_cols)), shape=shape)
+            a_rows, a_cols = self._matched
+            self._adjacency = sparse.csr_matrix(
+                (np.ones(len(a_rows), dtype=np.float64), (a_rows, a_cols)), shape=shape
+            )
+        return self._weights, self._adjacency
+
+    def score(self, resume_keywords):
+        """
+        Keyword match of every resume against every job
+
+        Args:
+            resume_keywords: List of extract_keywords sets, one per resume
+
+        Returns:
+            KeywordMatchResult: keyword_match array (resumes x jobs) and common keywords
+        """
+        for keywords in resume_keywords:
+            self._add_resume_terms(keywords)
+        weights, adjacency = self._matrices()
+        resumes = self._term_matrix(resume_keywords, self._resume_index, len(self._resume_index))
+
+        job_matrix_t = self.job_matrix.T.tocsr()
+        fuzzy_sums = (resumes @ weights.T @ job_matrix_t).toarray()
+        covered = (resumes @ adjacency.T).tocsr()
+        covered.data[:] = 1.0
+        matched_counts = (covered @ job_matrix_t).toarray()
+
+        job_sizes = self.job_sizes[np.newaxis, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            keyword_match = np.where(
+                job_sizes > 0,
+                np.minimum(1.0, matched_counts / job_sizes + (fuzzy_sums / job_sizes) * 0.15),
+                0.0
+            )
+        return KeywordMatchResult(self, keyword_match, covered)
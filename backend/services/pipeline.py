@@ -0,0 +1,37 @@
+"""
+Shared executor for overlapping the independent stages of one request
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import get_config
+
+config = get_config()
+
+# Shared by all requests in the worker, created on first use
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def submit_stage(func, *args):
+    """
+    Run a request stage on the shared stage executor
+
+    Stages must not wait on each other's futures inside the executor, so a
+    bounded pool cannot deadlock.
+
+    Args:
+        func: Callable to run
+        *args: Arguments for func
+
+    Returns:
+        Future: The running (or queued) stage
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.PIPELINE_THREADS,
+                    thread_name_prefix='pipeline'
+                )
+    return _executor.submit(func, *args)
@@ -0,0 +1,289 @@
+"""
+Incremental re-scoring sessions for iterative resume edits
+"""
+import os
+import re
+import json
+import time
+import uuid
+import zlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from config import get_config
+from models import get_bert_embeddings, get_bert_embeddings_batch, count_tokens
+from utils import extract_keywords
+from .analyzer import calculate_match_score
+
+config = get_config()
+
+# Global session store (LRU order, oldest first), backed by files in SESSION_DIR
+_sessions = OrderedDict()
+_sessions_lock = threading.Lock()
+
+_SESSION_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+def split_into_chunks(text, target_lines=None):
+    """
+    Split resume text into content-defined chunks of lines
+
+    A chunk ends at a blank line, or after a line whose hash marks a boundary,
+    so boundaries depend only on nearby content: an edit changes the chunk it
+    falls in and leaves the other chunks byte-identical.
+
+    Args:
+        text: Resume text string
+        target_lines: Average number of lines per chunk
+
+    Returns:
+        list: Chunk strings in document order
+    """
+    target_lines = target_lines or config.SESSION_CHUNK_LINES
+    chunks = []
+    current = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            current.append(line)
+        if current and (
+            not line
+            or zlib.crc32(line.encode('utf-8')) % target_lines == 0
+            or len(current) >= target_lines * 2
+        ):
+            chunks.append('\n'.join(current))
+            current = []
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+
+class AnalysisSession:
+    """
+    Scores successive revisions of one resume against a fixed job description
+
+    The job description embedding and keywords are computed once. For the
+    resume, each chunk's embedding and keyword set are kept between
+    submissions, and only chunks that did not appear in the previous revision
+    are encoded.
+
+    /analyze encodes the resume in one pass, so the model only sees its first
+    max_seq_length tokens. To compare like with like, the resume embedding is
+    the token-weighted mean of the normalized embeddings of the chunks within
+    that same token prefix (a chunk straddling the limit counts for the
+    tokens before it). Keywords cover the whole resume, as in /analyze.
+
+    Scores are still approximate: a mean of chunk embeddings is not the
+    embedding of the prefix encoded in one pass, and keyword bigrams spanning
+    two chunks are not counted.
+    """
+
+    def __init__(self, job_description, job_emb=None, job_keywords=None, chunks=None, session_id=None):
+        self.session_id = session_id or uuid.uuid4().hex
+        self.job_description = job_description
+        self.job_emb = get_bert_embeddings(job_description) if job_emb is None else job_emb
+        self.job_keywords = extract_keywords(job_description) if job_keywords is None else job_keywords
+        self.last_used = time.time()
+        self._chunks = chunks or {}  # chunk text -> (normalized embedding, keyword set, token count)
+        self._max_tokens = None  # Text tokens the model encodes in one pass (set on first encode)
+        self._lock = threading.Lock()
+
+    def save(self, path):
+        """Write the session state to a file (atomically replaced)"""
+        with self._lock:
+            chunks = list(self._chunks)
+            embeddings = [self._chunks[chunk][0] for chunk in chunks]
+            keywords = [sorted(self._chunks[chunk][1]) for chunk in chunks]
+            tokens = [self._chunks[chunk][2] for chunk in chunks]
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                job_description=np.array(self.job_description),
+                job_emb=np.asarray(self.job_emb, dtype=np.float32),
+                job_keywords=np.array(json.dumps(sorted(self.job_keywords))),
+                chunks=np.array(json.dumps(chunks)),
+                chunk_embeddings=np.vstack(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32),
+                chunk_keywords=np.array(json.dumps(keywords)),
+                chunk_tokens=np.array(tokens, dtype=np.int64)
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, session_id):
+        """Restore a session written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            chunks = json.loads(str(data['chunks']))
+            chunk_keywords = json.loads(str(data['chunk_keywords']))
+            chunk_embeddings = data['chunk_embeddings']
+            chunk_tokens = data['chunk_tokens']
+            session = cls(
+                str(data['job_description']),
+                job_emb=data['job_emb'],
+                job_keywords=set(json.loads(str(data['job_keywords']))),
+                chunks={
+                    chunk: (chunk_embeddings[i], set(chunk_keywords[i]), int(chunk_tokens[i]))
+                    for i, chunk in enumerate(chunks)
+                },
+                session_id=session_id
+            )
+        session.last_used = os.path.getmtime(path)
+        return session
+
+    def _prefix_weights(self, token_counts):
+        """Tokens of each chunk that fall within the prefix /analyze encodes"""
+        if self._max_tokens is None:
+            # Restored session with no chunk encoded since: look the limit up once
+            _, self._max_tokens = count_tokens([])
+        budget = self._max_tokens
+        weights = []
+        for tokens in token_counts:
+            take = min(tokens, budget)
+            weights.append(take)
+            budget -= take
+        return np.array(weights, dtype=np.float32)
+
+    def score(self, resume_text, experience_level):
+        """
+        Score a resume revision, re-encoding only changed chunks
+
+        Args:
+            resume_text: Resume text string
+            experience_level: Experience level ('intern', 'fresher', 'experienced')
+
+        Returns:
+            tuple: (calculate_match_score result tuple, stats dict)
+        """
+        chunks = split_into_chunks(resume_text)
+        if not chunks:
+            chunks = [resume_text.strip()]
+
+        with self._lock:
+            self.last_used = time.time()
+            changed = [chunk for chunk in dict.fromkeys(chunks) if chunk not in self._chunks]
+            if changed:
+                embeddings = get_bert_embeddings_batch(changed)
+                norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+                embeddings = embeddings / np.maximum(norms, 1e-12)
+                token_counts, self._max_tokens = count_tokens(changed)
+                for chunk, embedding, tokens in zip(changed, embeddings, token_counts):
+                    self._chunks[chunk] = (embedding, extract_keywords(chunk), tokens)
+
+            # Keep only the current revision's chunks
+            self._chunks = {chunk: self._chunks[chunk] for chunk in chunks}
+            chunk_embeddings = np.vstack([self._chunks[chunk][0] for chunk in chunks])
+            weights = self._prefix_weights([self._chunks[chunk][2] for chunk in chunks])
+            if weights.sum() <= 0:
+                weights = np.array([len(chunk) for chunk in chunks], dtype=np.float32)
+            resume_emb = (weights @ chunk_embeddings / weights.sum()).reshape(1, -1)
+
+            resume_keywords = set()
+            for chunk in chunks:
+                resume_keywords.update(self._chunks[chunk][1])
+
+        result = calculate_match_score(
+            resume_text, self.job_description, experience_level,
+            resume_emb=resume_emb, job_emb=self.job_emb,
+            resume_keywords=resume_keywords, job_keywords=self.job_keywords
+        )
+        stats = {'chunks': len(chunks), 'encodedChunks': len(changed)}
+        return result, stats
+
+
+def _session_path(session_id):
+    return os.path.join(config.SESSION_DIR, f"{session_id}.npz")
+
+
+def _evict_sessions(now):
+    """Drop expired sessions and trim the in-memory store to its size limit (lock held)"""
+    for session_id in list(_sessions):
+        if now - _sessions[session_id].last_used > config.SESSION_TTL_SECONDS:
+            del _sessions[session_id]
+    while len(_sessions) > config.SESSION_CACHE_SIZE:
+        _sessions.popitem(last=False)
+
+
+def _remove_expired_files(now):
+    """Delete session files idle for longer than the TTL"""
+    for name in os.listdir(config.SESSION_DIR):
+        path = os.path.join(config.SESSION_DIR, name)
+        try:
+            if now - os.path.getmtime(path) > config.SESSION_TTL_SECONDS:
+                os.remove(path)
+        except OSError:
+            # Removed or replaced by another worker meanwhile
+            continue
+
+
+def create_session(job_description):
+    """
+    Start an analysis session for a job description
+
+    The session is not stored until save_session is called, so a failed
+    first analysis leaves nothing behind.
+
+    Args:
+        job_description: Job description text string
+
+    Returns:
+        AnalysisSession: New session (session.session_id is its identifier)
+    """
+    return AnalysisSession(job_description)
+
+
+def save_session(session):
+    """
+    Store a session after a successful score
+
+    Sessions are written to config.SESSION_DIR as well as kept in memory, so
+    they survive worker restarts (gunicorn --max-requests) and are visible
+    to every worker on the host.
+
+    Args:
+        session: AnalysisSession
+    """
+    os.makedirs(config.SESSION_DIR, exist_ok=True)
+    session.save(_session_path(session.session_id))
+    now = time.time()
+    with _sessions_lock:
+        _sessions[session.session_id] = session
+        _sessions.move_to_end(session.session_id)
+        _evict_sessions(now)
+    _remove_expired_files(now)
+
+
+def get_session(session_id):
+    """
+    Look up a live analysis session
+
+    Args:
+        session_id: Session identifier
+
+    Returns:
+        AnalysisSession: The session, or None if unknown or expired
+    """
+    if not _SESSION_ID_PATTERN.match(session_id):
+        return None
+
+    now = time.time()
+    with _sessions_lock:
+        _evict_sessions(now)
+        session = _sessions.get(session_id)
+        if session is not None:
+            _sessions.move_to_end(session_id)
+            return session
+
+    # Stored by another worker, or before this worker was recycled
+    path = _session_path(session_id)
+    try:
+        if now - os.path.getmtime(path) > config.SESSION_TTL_SECONDS:
+            return None
+        session = AnalysisSession.load(path, session_id)
+    except (OSError, ValueError, KeyError):
+        return None
+
+    with _sessions_lock:
+        _sessions[session_id] = session
+        _evict_sessions(now)
+    return session
@@ -0,0 +1,47 @@
+"""
+Resuming bulk_score output after an interrupted write
+"""
+import csv
+import json
+from bulk_score import ResultWriter, load_checkpoint
+
+ROW = {
+    'resume': 'a.pdf', 'job': 'backend', 'experience_level': 'fresher', 'match_score': 73,
+    'skills_match': 70, 'experience_match': 68, 'keyword_match': 41, 'common_keywords': ['python']
+}
+
+
+def _write(path, output_format, rows):
+    writer = ResultWriter(str(path), output_format)
+    for row in rows:
+        writer.write(row)
+    writer.close()
+
+
+def test_csv_partial_row_is_dropped_and_rescored(tmp_path):
+    path = tmp_path / 'scores.csv'
+    _write(path, 'csv', [ROW, dict(ROW, resume='b.pdf')])
+    text = path.read_text()
+    # Cut inside the last row's match_score column
+    path.write_text(text[:text.rindex('b.pdf,backend,fresher,7') + len('b.pdf,backend,fresher,7')])
+
+    assert load_checkpoint(str(path), 'csv') == {('a.pdf', 'backend')}
+    _write(path, 'csv', [dict(ROW, resume='b.pdf')])
+
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['resume'] for row in rows] == ['a.pdf', 'b.pdf']
+    assert rows[1]['match_score'] == '73' and rows[1]['keyword_match'] == '41'
+
+
+def test_jsonl_partial_line_is_removed(tmp_path):
+    path = tmp_path / 'scores.jsonl'
+    _write(path, 'jsonl', [ROW])
+    with open(path, 'a') as f:
+        f.write('{"resume": "b.pdf", "jo')
+
+    assert load_checkpoint(str(path), 'jsonl') == {('a.pdf', 'backend')}
+    _write(path, 'jsonl', [dict(ROW, resume='b.pdf')])
+
+    with open(path) as f:
+        assert [json.loads(line)['resume'] for line in f] == ['a.pdf', 'b.pdf']
@@ -0,0 +1,65 @@
+"""
+KeywordMatchEngine must report the same keyword scores as calculate_keyword_match
+"""
+import random
+import pytest
+from services.analyzer import calculate_keyword_match, combine_match_scores
+from services.keyword_engine import KeywordMatchEngine
+
+# Overlapping terms so exact, substring and character-similarity matches all occur
+VOCABULARY = [
+    'python', 'pythonic', 'react', 'reactjs', 'javascript', 'java', 'typescript',
+    'machine learning', 'learning', 'docker', 'kubernetes', 'aws', 'sql', 'mysql',
+    'postgresql', 'developer', 'develop', 'engineering', 'engineer', 'data', 'database',
+    'dataset', 'flask', 'django', 'node', 'nodejs', 'api', 'rest', 'restful', 'cloud',
+    'team', 'teams', 'leader', 'leadership', 'manage', 'managed', 'management',
+    'analysis', 'analytics', 'café', 'naïve', 'résumé', 'abcde', 'edcba'
+]
+
+
+def _keyword_sets(rng, count, max_size):
+    return [set(rng.sample(VOCABULARY, rng.randint(0, max_size))) for _ in range(count)]
+
+
+def _assert_matches_loop(engine, result, resume_keywords, job_keywords):
+    for i, resume in enumerate(resume_keywords):
+        for j, job in enumerate(job_keywords):
+            keyword_match, common_keywords = calculate_keyword_match(resume, job)
+            assert result.keyword_match[i, j] == pytest.approx(keyword_match, abs=1e-12)
+            assert result.common_keywords(i, j) == common_keywords
+            for level in ('intern', 'fresher', 'experienced'):
+                assert combine_match_scores(0.6, result.keyword_match[i, j], level) == \
+                    combine_match_scores(0.6, keyword_match, level)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_engine_matches_calculate_keyword_match(seed):
+    rng = random.Random(seed)
+    job_keywords = _keyword_sets(rng, 12, 20)
+    resume_keywords = _keyword_sets(rng, 12, 25)
+
+    engine = KeywordMatchEngine(job_keywords)
+    _assert_matches_loop(engine, engine.score(resume_keywords), resume_keywords, job_keywords)
+
+    # A second batch reuses (and extends) the resume term columns
+    more_resume_keywords = _keyword_sets(rng, 6, 25)
+    _assert_matches_loop(engine, engine.score(more_resume_keywords), more_resume_keywords, job_keywords)
+
+
+def test_summation_order_does_not_change_reported_percent():
+    # The loop gives 0.27999999999999997 here and the engine 0.28
+    resume = {'manage', 'restful', 'teams'}
+    job = {
+        'develop', 'django', 'docker', 'engineer', 'java', 'leadership',
+        'manage', 'managed', 'nodejs', 'python', 'reactjs', 'sql'
+    }
+    keyword_match, _ = calculate_keyword_match(resume, job)
+    engine_match = KeywordMatchEngine([job]).score([resume]).keyword_match[0, 0]
+
+    assert combine_match_scores(0.6, keyword_match)[3] == combine_match_scores(0.6, engine_match)[3] == 28
+
+
+def test_empty_inputs():
+    assert KeywordMatchEngine([]).score([{'python'}]).keyword_match.shape == (1, 0)
+    assert KeywordMatchEngine([{'python'}]).score([]).keyword_match.shape == (0, 1)
+    assert KeywordMatchEngine([set()]).score([{'python'}]).keyword_match[0, 0] == 0
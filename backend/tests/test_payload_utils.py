@@ -0,0 +1,118 @@
+"""
+Decoding and verification of pre-extracted resume text payloads
+"""
+import gzip
+import hashlib
+import json
+import pytest
+from utils import payload_utils
+from utils.payload_utils import PayloadError, decompress_payload, parse_text_payload
+
+RESUME_TEXT = 'Python developer with three years of Flask, Docker and SQL experience. ' * 3
+
+
+def _payload(**fields):
+    payload = {
+        'resumeText': RESUME_TEXT,
+        'resumeTextHash': hashlib.sha256(RESUME_TEXT.encode('utf-8')).hexdigest(),
+        'jobDescription': 'Backend engineer working on Python services',
+        'experienceLevel': 'fresher'
+    }
+    payload.update(fields)
+    return json.dumps(payload).encode('utf-8')
+
+
+def test_valid_payload():
+    payload = parse_text_payload(_payload())
+    assert payload['resumeText'] == RESUME_TEXT.strip()
+    assert payload['experienceLevel'] == 'fresher'
+
+
+def test_hash_mismatch():
+    with pytest.raises(PayloadError, match='hash does not match') as excinfo:
+        parse_text_payload(_payload(resumeTextHash=hashlib.sha256(b'other').hexdigest()))
+    assert excinfo.value.status_code == 400
+
+
+def test_missing_hash():
+    with pytest.raises(PayloadError, match='No resume text hash'):
+        parse_text_payload(_payload(resumeTextHash=None))
+
+
+@pytest.mark.parametrize('field, value', [
+    ('jobDescription', ['x', 'x']),
+    ('jobDescription', {'text': 'x'}),
+    ('experienceLevel', 5),
+    ('experienceLevel', True),
+])
+def test_non_string_fields_rejected(field, value):
+    with pytest.raises(PayloadError, match=f'{field} must be a string') as excinfo:
+        parse_text_payload(_payload(**{field: value}))
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.parametrize('value', [123, ['text']])
+def test_non_string_resume_text_rejected(value):
+    with pytest.raises(PayloadError, match='No resume text'):
+        parse_text_payload(_payload(resumeText=value))
+
+
+def test_null_optional_fields_allowed():
+    payload = parse_text_payload(_payload(experienceLevel=None))
+    assert payload['experienceLevel'] is None
+
+
+@pytest.mark.parametrize('data', [b'not json', b'[1, 2]', b'\xff\xfe'])
+def test_invalid_json(data):
+    with pytest.raises(PayloadError, match='Invalid JSON'):
+        parse_text_payload(data)
+
+
+def test_gzip_roundtrip():
+    assert decompress_payload(gzip.compress(_payload()), 'gzip') == _payload()
+
+
+def test_gzip_over_limit(monkeypatch):
+    monkeypatch.setattr(payload_utils.config, 'MAX_TEXT_PAYLOAD_SIZE', 1024)
+    bomb = gzip.compress(b'a' * (1024 * 1024))
+    with pytest.raises(PayloadError) as excinfo:
+        decompress_payload(bomb, 'gzip')
+    assert excinfo.value.status_code == 413
+
+
+def test_identity_over_limit(monkeypatch):
+    monkeypatch.setattr(payload_utils.config, 'MAX_TEXT_PAYLOAD_SIZE', 1024)
+    with pytest.raises(PayloadError) as excinfo:
+        decompress_payload(b'a' * 1025, '')
+    assert excinfo.value.status_code == 413
+
+
+def test_corrupt_gzip():
+    with pytest.raises(PayloadError, match='Could not decompress') as excinfo:
+        decompress_payload(b'not gzip', 'gzip')
+    assert excinfo.value.status_code == 400
+
+
+def test_unsupported_encoding():
+    with pytest.raises(PayloadError) as excinfo:
+        decompress_payload(b'data', 'br')
+    assert excinfo.value.status_code == 415
+
+
+@pytest.mark.skipif(payload_utils.zstandard is None, reason='zstandard not installed')
+def test_zstd_roundtrip_and_limit(monkeypatch):
+    zstandard = payload_utils.zstandard
+    assert decompress_payload(zstandard.ZstdCompressor().compress(_payload()), 'zstd') == _payload()
+
+    monkeypatch.setattr(payload_utils.config, 'MAX_TEXT_PAYLOAD_SIZE', 1024)
+    bomb = zstandard.ZstdCompressor().compress(b'a' * (1024 * 1024))
+    with pytest.raises(PayloadError) as excinfo:
+        decompress_payload(bomb, 'zstd')
+    assert excinfo.value.status_code == 413
+
+
+def test_zstd_unavailable(monkeypatch):
+    monkeypatch.setattr(payload_utils, 'zstandard', None)
+    with pytest.raises(PayloadError) as excinfo:
+        decompress_payload(b'data', 'zstd')
+    assert excinfo.value.status_code == 415
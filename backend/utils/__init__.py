@@ -3,11 +3,15 @@ Initialize utils package
 """
 from .pdf_utils import validate_pdf, extract_text_from_pdf, get_secure_filename
 from .text_utils import extract_keywords, detect_experience_level
+from .payload_utils import PayloadError, decompress_payload, parse_text_payload
 
 __all__ = [
     'validate_pdf',
     'extract_text_from_pdf',
     'get_secure_filename',
     'extract_keywords',
-    'detect_experience_level'
+    'detect_experience_level',
+    'PayloadError',
+    'decompress_payload',
+    'parse_text_payload'
 ]
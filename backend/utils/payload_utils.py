@@ -0,0 +1,121 @@
+"""
+Pre-extracted resume text payload utilities
+"""
+import hashlib
+import json
+import zlib
+from config import get_config
+
+try:
+    import zstandard
+except ImportError:  # Optional: only needed for zstd-encoded payloads
+    zstandard = None
+
+config = get_config()
+
+
+class PayloadError(ValueError):
+    """Invalid text payload, with the HTTP status to report it with"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def decompress_payload(data, content_encoding=''):
+    """
+    Decompress a request body, bounded by config.MAX_TEXT_PAYLOAD_SIZE
+    
+    Args:
+        data: Raw request body bytes
+        content_encoding: Content-Encoding header ('', 'identity', 'gzip' or 'zstd')
+        
+    Returns:
+        bytes: Decompressed body
+        
+    Raises:
+        PayloadError: If the encoding is unsupported, the body is corrupt or too large
+    """
+    encoding = (content_encoding or '').strip().lower()
+    limit = config.MAX_TEXT_PAYLOAD_SIZE
+    
+    try:
+        if encoding in ('', 'identity'):
+            result = data
+        elif encoding == 'gzip':
+            # Stop one byte past the limit rather than inflating a whole bomb
+            result = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(data, limit + 1)
+        elif encoding == 'zstd':
+            if zstandard is None:
+                raise PayloadError('zstd payloads are not supported by this server', 415)
+            reader = zstandard.ZstdDecompressor().stream_reader(data)
+            result = b''
+            while len(result) <= limit:
+                chunk = reader.read(limit + 1 - len(result))
+                if not chunk:
+                    break
+                result += chunk
+        else:
+            raise PayloadError(f'Unsupported content encoding: {encoding}', 415)
+    except PayloadError:
+        raise
+    except Exception as e:
+        print(f"Error decompressing payload: {str(e)}")
+        raise PayloadError('Could not decompress the request payload')
+    
+    if len(result) > limit:
+        raise PayloadError(f'Payload exceeds {limit // 1024}KB after decompression', 413)
+    return result
+
+
+def parse_text_payload(data):
+    """
+    Parse and verify a JSON payload of pre-extracted resume text
+    
+    Expected JSON fields:
+        - resumeText: Resume text extracted by the client
+        - resumeTextHash: SHA-256 hex digest of resumeText (UTF-8)
+        - jobDescription, experienceLevel: As in the form upload
+    
+    Args:
+        data: Decompressed request body bytes
+        
+    Returns:
+        dict: Payload with 'resumeText' stripped and verified
+        
+    Raises:
+        PayloadError: If the payload is malformed, fails verification or length limits
+    """
+    try:
+        payload = json.loads(data.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        raise PayloadError('Invalid JSON payload')
+    
+    if not isinstance(payload, dict):
+        raise PayloadError('Invalid JSON payload')
+    
+    # Optional text fields are used as-is, so anything but a string (or null) is rejected
+    for field in ('jobDescription', 'experienceLevel'):
+        if payload.get(field) is not None and not isinstance(payload[field], str):
+            raise PayloadError(f'{field} must be a string')
+    
+    resume_text = payload.get('resumeText')
+    if not isinstance(resume_text, str) or not resume_text.strip():
+        raise PayloadError('No resume text provided')
+    
+    expected_hash = payload.get('resumeTextHash')
+    if not isinstance(expected_hash, str) or not expected_hash:
+        raise PayloadError('No resume text hash provided')
+    
+    if hashlib.sha256(resume_text.encode('utf-8')).hexdigest() != expected_hash.strip().lower():
+        raise PayloadError('Resume text hash does not match the resume text')
+    
+    resume_text = resume_text.strip()
+    if len(resume_text) < config.MIN_RESUME_TEXT_LENGTH:
+        raise PayloadError(f'Resume text must be at least {config.MIN_RESUME_TEXT_LENGTH} characters')
+    
+    if len(resume_text) > config.MAX_RESUME_TEXT_LENGTH:
+        raise PayloadError(f'Resume text must be less than {config.MAX_RESUME_TEXT_LENGTH} characters')
+    
+    payload['resumeText'] = resume_text
+    return payload
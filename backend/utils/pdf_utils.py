@@ -64,7 +64,7 @@ def extract_text_from_pdf(pdf_file):
             
         return text.strip()
     except Exception as e:
-        logger.error(f"Error reading PDF: {str(e)}", exc_info=True)
+        print(f"Error reading PDF: {str(e)}")
         return None
 
 